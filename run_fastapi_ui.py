@@ -11,8 +11,6 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root / "src"))
 
-from thunder_subtitle_cli.web_ui_fastapi import run_server
-
 import os
 
 def signal_handler(signum, frame):
@@ -28,6 +26,9 @@ if __name__ == "__main__":
     host = os.environ.get("HOST", "0.0.0.0")
     port = int(os.environ.get("PORT", "8010"))
     
+    # 延迟导入：FastAPI/uvicorn 及配置加载只在真正启动服务时才发生
+    from thunder_subtitle_cli.web_ui_fastapi import run_server
+    
     try:
         run_server(host=host, port=port)
     except KeyboardInterrupt:
@@ -4,69 +4,151 @@ AI字幕质量评估模块
 """
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import re
 import json
 import time
-from dataclasses import dataclass
-from typing import Any, Optional
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Any, Iterable, Optional
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
     HAS_OPENAI = True
 except ImportError:
     HAS_OPENAI = False
 
+try:
+    from rapidfuzz import fuzz
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# httpx 只有在安装 h2 时才支持 HTTP/2
+_HAS_H2 = importlib.util.find_spec("h2") is not None
+
+
+_EXT_RE = re.compile(r'\.(mp4|avi|mkv|mov|wmv|flv|webm|m4v|rmvb|rm|ts|m2ts|strm|srt|ass|ssa|sub)$')
+# 分隔符一次性替换为空格，空白的折叠交给 str.split()
+_SEP_TRANS = str.maketrans({c: ' ' for c in '._-[]()（）'})
+# 字母与数字的交界处插入空格（两个方向合并为一次扫描）
+_ALNUM_BOUNDARY_RE = re.compile(r'(?<=[a-z])(?=\d)|(?<=\d)(?=[a-z])')
+_YEAR_RE = re.compile(r'(19\d{2}|20\d{2})')
+# token_set_ratio 低于该值视为完全不匹配（保持“匹配度为0则跳过”的语义）
+_FUZZY_SCORE_CUTOFF = 50.0
+
+_BRACE_RE = re.compile(r'\{[^}]*\}')
+# Dialogue 行的前 9 个字段之后才是字幕文本（文本本身可能含逗号）
+_DIALOGUE_RE = re.compile(r'^Dialogue:(?:[^,]*,){9}(.*)$')
+
+_INVALID_PATTERNS = (
+    r'第一会所',
+    r'sis001\.com',
+    r'BT压片组',
+    r'getsisurl@gmail\.com',
+    r'云的守望',
+    r'压制组',
+    r'字幕组.*广告',
+    r'www\.[a-z0-9]+\.com',
+)
+
+# 合并成一个正则扫描一次；放在零宽前瞻里，相互重叠的命中（如 www.sis001.com）也都能统计到
+_INVALID_RE = re.compile(
+    '(?=' + '|'.join(f'(?P<invalid{i}>{p})' for i, p in enumerate(_INVALID_PATTERNS)) + ')',
+    re.IGNORECASE,
+)
+
+# (分组名, 正则, 描述, 扣分)；各模式的字符集互不相交，合并成一个正则扫描一次即可
+_MT_PATTERNS = [
+    ('de', r'的{3,}', '连续多个"的"', -1),
+    ('le', r'了{3,}', '连续多个"了"', -1),
+    ('shi', r'是{3,}', '连续多个"是"', -1),
+    ('rep', r'我我我|你你你|他他他', '重复代词', -1.5),
+    ('punct', r'[，。、]{2,}', '连续标点', -0.5),
+]
+_MT_RE = re.compile('|'.join(f'(?P<{name}>{p})' for name, p, _, _ in _MT_PATTERNS))
+
+_PUNCT_CHARS = '，。！？、'
+
+
+def _normalize_filename(name: str) -> str:
+    name = name.lower()
+    name = _EXT_RE.sub('', name)
+    name = name.translate(_SEP_TRANS)
+    name = _ALNUM_BOUNDARY_RE.sub(' ', name)
+    return ' '.join(name.split())
+
+
+class _FilenameMatcher:
+    """视频文件名的归一化结果，对多个字幕名打分时只计算一次"""
+
+    def __init__(self, video_name: str):
+        self.norm = _normalize_filename(video_name)
+        self.words = set(self.norm.split())
+        self.years = set(_YEAR_RE.findall(self.norm))
+        self.alnum = self.norm.replace(' ', '')
+
+    def score(self, subtitle_name: str) -> float:
+        video_norm = self.norm
+        subtitle_norm = _normalize_filename(subtitle_name)
+        
+        if video_norm == subtitle_norm:
+            return 100.0
+        
+        if not video_norm or not subtitle_norm:
+            return 0.0
+        
+        if HAS_RAPIDFUZZ:
+            similarity = fuzz.token_set_ratio(video_norm, subtitle_norm, score_cutoff=_FUZZY_SCORE_CUTOFF)
+        else:
+            subtitle_words = set(subtitle_norm.split())
+            common_words = self.words & subtitle_words
+            similarity = len(common_words) / len(self.words) * 100
+        
+        subtitle_years = set(_YEAR_RE.findall(subtitle_norm))
+        
+        if self.years and subtitle_years:
+            if self.years & subtitle_years:
+                similarity += 10
+            else:
+                similarity -= 20
+        
+        if video_norm in subtitle_norm or subtitle_norm in video_norm:
+            similarity = max(similarity, 80.0)
+        
+        subtitle_alnum = subtitle_norm.replace(' ', '')
+        if self.alnum == subtitle_alnum:
+            similarity = 100.0
+        elif self.alnum in subtitle_alnum or subtitle_alnum in self.alnum:
+            similarity = max(similarity, 85.0)
+        
+        return min(100.0, max(0.0, similarity))
+
 
 def calculate_filename_similarity(video_name: str, subtitle_name: str) -> float:
     """
     计算视频文件名与字幕文件名的匹配度
     返回 0-100 的分数
     """
-    def normalize(name: str) -> str:
-        name = name.lower()
-        name = re.sub(r'\.(mp4|avi|mkv|mov|wmv|flv|webm|m4v|rmvb|rm|ts|m2ts|strm|srt|ass|ssa|sub)$', '', name)
-        name = re.sub(r'[._\-\[\]()（）\s]+', ' ', name)
-        name = re.sub(r'([a-z])(\d)', r'\1 \2', name)
-        name = re.sub(r'(\d)([a-z])', r'\1 \2', name)
-        name = re.sub(r'\s+', ' ', name).strip()
-        return name
-    
-    video_norm = normalize(video_name)
-    subtitle_norm = normalize(subtitle_name)
-    
-    if video_norm == subtitle_norm:
-        return 100.0
-    
-    video_words = set(w for w in video_norm.split() if w)
-    subtitle_words = set(w for w in subtitle_norm.split() if w)
-    
-    if not video_words or not subtitle_words:
-        return 0.0
-    
-    common_words = video_words & subtitle_words
-    similarity = len(common_words) / len(video_words) * 100
-    
-    year_pattern = r'(19\d{2}|20\d{2})'
-    video_years = set(re.findall(year_pattern, video_norm))
-    subtitle_years = set(re.findall(year_pattern, subtitle_norm))
-    
-    if video_years and subtitle_years:
-        if video_years & subtitle_years:
-            similarity += 10
-        else:
-            similarity -= 20
-    
-    if video_norm in subtitle_norm or subtitle_norm in video_norm:
-        similarity = max(similarity, 80.0)
-    
-    video_alnum = re.sub(r'\s+', '', video_norm)
-    subtitle_alnum = re.sub(r'\s+', '', subtitle_norm)
-    if video_alnum == subtitle_alnum:
-        similarity = 100.0
-    elif video_alnum in subtitle_alnum or subtitle_alnum in video_alnum:
-        similarity = max(similarity, 85.0)
-    
-    return min(100.0, max(0.0, similarity))
+    return _FilenameMatcher(video_name).score(subtitle_name)
+
+
+def calculate_filename_similarities(video_name: str, subtitle_names: Iterable[str]) -> list[float]:
+    """
+    批量计算同一视频文件名与多个字幕文件名的匹配度
+    视频文件名只归一化一次，结果顺序与 subtitle_names 一致
+    """
+    matcher = _FilenameMatcher(video_name)
+    return [matcher.score(name) for name in subtitle_names]
 
 
 @dataclass
@@ -86,51 +168,47 @@ class QualityResult:
     elapsed_time: float = 0.0
 
 
+def _extract_json(s: str) -> Optional[str]:
+    """截取第一个 '{' 到最后一个 '}' 之间的内容（模型偶尔会在JSON前后附带说明文字）"""
+    i = s.find('{')
+    j = s.rfind('}')
+    return s[i:j + 1] if 0 <= i < j else None
+
+
 def extract_text_from_srt(content: str) -> str:
     """从SRT格式中提取纯文本"""
-    lines = content.split('\n')
-    text_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        if line.isdigit():
-            continue
-        if '-->' in line:
-            continue
-        text_lines.append(line)
-    
-    return '\n'.join(text_lines)
+    return '\n'.join(
+        line
+        for line in (raw.strip() for raw in content.splitlines())
+        if line and not line.isdigit() and '-->' not in line
+    )
 
 
-def extract_text_from_ass(content: str) -> str:
-    """从ASS格式中提取纯文本"""
-    lines = content.split('\n')
-    text_lines = []
+def _iter_ass_dialogue(content: str):
     in_events = False
-    
-    for line in lines:
-        line = line.strip()
+    for raw in content.splitlines():
+        line = raw.strip()
         
         if line.startswith('[Events]'):
             in_events = True
             continue
         
-        if line.startswith('[') and in_events:
-            break
-        
-        if in_events and line.startswith('Dialogue:'):
-            parts = line.split(',', 9)
-            if len(parts) >= 10:
-                text = parts[9]
-                text = re.sub(r'\{[^}]*\}', '', text)
-                text = re.sub(r'\\N', '\n', text)
-                text = text.strip()
-                if text:
-                    text_lines.append(text)
-    
-    return '\n'.join(text_lines)
+        if not in_events:
+            continue
+        
+        if line.startswith('['):
+            return
+        
+        m = _DIALOGUE_RE.match(line)
+        if m:
+            text = _BRACE_RE.sub('', m.group(1)).replace('\\N', '\n').strip()
+            if text:
+                yield text
+
+
+def extract_text_from_ass(content: str) -> str:
+    """从ASS格式中提取纯文本"""
+    return '\n'.join(_iter_ass_dialogue(content))
 
 
 def extract_text(content: str, ext: str) -> str:
@@ -142,6 +220,93 @@ def extract_text(content: str, ext: str) -> str:
         return extract_text_from_srt(content)
 
 
+_SYSTEM_PROMPT = "你是一个专业的字幕翻译质量评估专家。请客观评估字幕质量，识别机器翻译痕迹。只返回JSON格式的结果。"
+
+
+@functools.lru_cache(maxsize=16)
+def _make_client(api_key: str, base_url: str) -> "OpenAI":
+    """按 (api_key, base_url) 复用同一个客户端，批量评估时共享连接池"""
+    return OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultHttpxClient(http2=_HAS_H2),
+    )
+
+
+# 当前使用的异步客户端：(api_key, base_url, 事件循环, 客户端)；设置或循环变化时替换并关闭旧客户端
+_async_client: Optional[tuple[str, str, asyncio.AbstractEventLoop, "AsyncOpenAI"]] = None
+# 正在关闭的旧客户端任务，保留引用以免任务被回收
+_closing: set[Any] = set()
+
+
+def _close_async_client(loop: asyncio.AbstractEventLoop, client: "AsyncOpenAI") -> None:
+    """在旧客户端所属的事件循环上关闭它，释放其 httpx 连接池"""
+    if loop.is_closed():
+        # 循环已关闭，无法再等待 close()；丢弃引用后连接随传输对象一起被回收
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if loop is running:
+        task = loop.create_task(client.close())
+    else:
+        task = asyncio.run_coroutine_threadsafe(client.close(), loop)
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def _get_async_client(api_key: str, base_url: str) -> "AsyncOpenAI":
+    """异步客户端的连接池绑定在事件循环上，因此按当前运行的循环复用"""
+    global _async_client
+    loop = asyncio.get_running_loop()
+    cached = _async_client
+    if cached is not None and cached[:3] == (api_key, base_url, loop):
+        return cached[3]
+    client = AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultAsyncHttpxClient(http2=_HAS_H2),
+    )
+    _async_client = (api_key, base_url, loop, client)
+    if cached is not None:
+        _close_async_client(cached[2], cached[3])
+    return client
+
+
+# 同一字幕文本的AI评估结果缓存（批量模式下同一字幕常被重复评估）
+_AI_CACHE_MAX = 512
+_ai_cache: dict[str, QualityResult] = {}
+
+
+def _build_prompt(text: str) -> str:
+    return f"""请评估以下字幕文本的翻译质量。
+
+字幕文本（前1500字符）:
+{text[:1500]}
+
+请从以下维度评估，每项0-10分：
+1. 流畅度：语句是否通顺自然，是否符合中文表达习惯
+2. 准确度：翻译是否准确传达原意，有无误译
+3. 本地化：是否自然流畅，有无机器翻译痕迹
+4. 专业性：专业术语翻译是否恰当
+
+请判断这是否为机器翻译的字幕。
+
+请以JSON格式返回结果（不要包含其他内容）：
+{{
+    "fluency": 分数,
+    "accuracy": 分数,
+    "localization": 分数,
+    "professionalism": 分数,
+    "overall_score": 综合分数(0-100),
+    "is_machine_translation": true或false,
+    "confidence": 置信度(0-1),
+    "issues": ["问题1", "问题2"],
+    "summary": "简短评价（50字以内）"
+}}"""
+
+
 class AIEvaluator:
     """AI质量评估器"""
     
@@ -161,18 +326,15 @@ class AIEvaluator:
     @property
     def client(self):
         if self._client is None and HAS_OPENAI and self.api_key:
-            self._client = OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url
-            )
+            self._client = _make_client(self.api_key, self.base_url)
         return self._client
     
     def is_available(self) -> bool:
         """检查AI评估是否可用"""
         return self.enabled and HAS_OPENAI and bool(self.api_key) and self.client is not None
     
-    def evaluate(self, content: str, ext: str) -> QualityResult:
-        """评估字幕质量"""
+    def _precheck(self, content: str, ext: str) -> tuple[Optional[QualityResult], str]:
+        """调用API前的检查，返回 (提前结束的结果, 提取出的文本)"""
         if not self.is_available():
             return QualityResult(
                 available=False,
@@ -186,7 +348,7 @@ class AIEvaluator:
                 issues=[],
                 summary="AI评估未启用或不可用",
                 error="AI评估未启用或不可用"
-            )
+            ), ""
         
         text = extract_text(content, ext)
         
@@ -203,23 +365,14 @@ class AIEvaluator:
                 issues=[],
                 summary="文本内容太少",
                 error="文本内容太少"
-            )
+            ), text
         
-        invalid_patterns = [
-            r'第一会所',
-            r'sis001\.com',
-            r'BT压片组',
-            r'getsisurl@gmail\.com',
-            r'云的守望',
-            r'压制组',
-            r'字幕组.*广告',
-            r'www\.[a-z0-9]+\.com',
-        ]
-        
-        invalid_count = 0
-        for pattern in invalid_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                invalid_count += 1
+        matched_patterns = set()
+        for m in _INVALID_RE.finditer(text):
+            matched_patterns.add(m.lastgroup)
+            if len(matched_patterns) >= 2:
+                break
+        invalid_count = len(matched_patterns)
         
         text_lines = [line.strip() for line in text.split('\n') if line.strip()]
         unique_lines = set(text_lines)
@@ -237,97 +390,121 @@ class AIEvaluator:
                 issues=["无效字幕", "仅包含广告水印"],
                 summary="无效字幕：仅包含广告水印，无实际内容",
                 error="无效字幕"
+            ), text
+        
+        return None, text
+    
+    def _cache_key(self, text: str) -> str:
+        # 只有前1500字符会发送给API，其余部分不影响结果
+        raw = f"{self.base_url}\n{self.model}\n{text[:1500]}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _remember(key: str, result: QualityResult) -> QualityResult:
+        if result.available:
+            if len(_ai_cache) >= _AI_CACHE_MAX:
+                _ai_cache.pop(next(iter(_ai_cache)))
+            _ai_cache[key] = result
+        return replace(result)
+    
+    def _request_kwargs(self, text: str) -> dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": _build_prompt(text)}
+            ],
+            "temperature": 0.1,
+            "max_tokens": 500,
+        }
+    
+    @staticmethod
+    def _parse_response(response_content: str, elapsed_time: float) -> QualityResult:
+        json_text = _extract_json(response_content)
+        if json_text is not None:
+            data = _json_loads(json_text)
+            return QualityResult(
+                available=True,
+                fluency=float(data.get('fluency', 0)),
+                accuracy=float(data.get('accuracy', 0)),
+                localization=float(data.get('localization', 0)),
+                professionalism=float(data.get('professionalism', 0)),
+                overall_score=float(data.get('overall_score', 0)),
+                is_machine_translation=bool(data.get('is_machine_translation', False)),
+                confidence=float(data.get('confidence', 0)),
+                issues=data.get('issues', []),
+                summary=data.get('summary', ''),
+                elapsed_time=elapsed_time
             )
+        return QualityResult(
+            available=False,
+            fluency=0,
+            accuracy=0,
+            localization=0,
+            professionalism=0,
+            overall_score=0,
+            is_machine_translation=False,
+            confidence=0,
+            issues=[],
+            summary="无法解析AI响应",
+            error="无法解析AI响应",
+            elapsed_time=elapsed_time
+        )
+    
+    @staticmethod
+    def _failed(e: Exception) -> QualityResult:
+        return QualityResult(
+            available=False,
+            fluency=0,
+            accuracy=0,
+            localization=0,
+            professionalism=0,
+            overall_score=0,
+            is_machine_translation=False,
+            confidence=0,
+            issues=[],
+            summary=f"评估失败: {str(e)}",
+            error=str(e)
+        )
+    
+    def evaluate(self, content: str, ext: str) -> QualityResult:
+        """评估字幕质量"""
+        early, text = self._precheck(content, ext)
+        if early is not None:
+            return early
+        
+        key = self._cache_key(text)
+        cached = _ai_cache.get(key)
+        if cached is not None:
+            return replace(cached)
         
         try:
             start_time = time.time()
-            
-            prompt = f"""请评估以下字幕文本的翻译质量。
-
-字幕文本（前1500字符）:
-{text[:1500]}
-
-请从以下维度评估，每项0-10分：
-1. 流畅度：语句是否通顺自然，是否符合中文表达习惯
-2. 准确度：翻译是否准确传达原意，有无误译
-3. 本地化：是否自然流畅，有无机器翻译痕迹
-4. 专业性：专业术语翻译是否恰当
-
-请判断这是否为机器翻译的字幕。
-
-请以JSON格式返回结果（不要包含其他内容）：
-{{
-    "fluency": 分数,
-    "accuracy": 分数,
-    "localization": 分数,
-    "professionalism": 分数,
-    "overall_score": 综合分数(0-100),
-    "is_machine_translation": true或false,
-    "confidence": 置信度(0-1),
-    "issues": ["问题1", "问题2"],
-    "summary": "简短评价（50字以内）"
-}}"""
-
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "你是一个专业的字幕翻译质量评估专家。请客观评估字幕质量，识别机器翻译痕迹。只返回JSON格式的结果。"},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=500
-            )
-            
+            response = self.client.chat.completions.create(**self._request_kwargs(text))
             elapsed_time = time.time() - start_time
-            
-            response_content = response.choices[0].message.content
-            
-            json_match = re.search(r'\{[\s\S]*\}', response_content)
-            if json_match:
-                data = json.loads(json_match.group())
-                return QualityResult(
-                    available=True,
-                    fluency=float(data.get('fluency', 0)),
-                    accuracy=float(data.get('accuracy', 0)),
-                    localization=float(data.get('localization', 0)),
-                    professionalism=float(data.get('professionalism', 0)),
-                    overall_score=float(data.get('overall_score', 0)),
-                    is_machine_translation=bool(data.get('is_machine_translation', False)),
-                    confidence=float(data.get('confidence', 0)),
-                    issues=data.get('issues', []),
-                    summary=data.get('summary', ''),
-                    elapsed_time=elapsed_time
-                )
-            else:
-                return QualityResult(
-                    available=False,
-                    fluency=0,
-                    accuracy=0,
-                    localization=0,
-                    professionalism=0,
-                    overall_score=0,
-                    is_machine_translation=False,
-                    confidence=0,
-                    issues=[],
-                    summary="无法解析AI响应",
-                    error="无法解析AI响应",
-                    elapsed_time=elapsed_time
-                )
-                
+            return self._remember(key, self._parse_response(response.choices[0].message.content, elapsed_time))
         except Exception as e:
-            return QualityResult(
-                available=False,
-                fluency=0,
-                accuracy=0,
-                localization=0,
-                professionalism=0,
-                overall_score=0,
-                is_machine_translation=False,
-                confidence=0,
-                issues=[],
-                summary=f"评估失败: {str(e)}",
-                error=str(e)
-            )
+            return self._failed(e)
+    
+    async def evaluate_async(self, content: str, ext: str) -> QualityResult:
+        """评估字幕质量（异步版本，可配合 asyncio.gather 并发评估）"""
+        early, text = self._precheck(content, ext)
+        if early is not None:
+            return early
+        
+        key = self._cache_key(text)
+        cached = _ai_cache.get(key)
+        if cached is not None:
+            return replace(cached)
+        
+        try:
+            start_time = time.time()
+            client = _get_async_client(self.api_key, self.base_url)
+            response = await client.chat.completions.create(**self._request_kwargs(text))
+            elapsed_time = time.time() - start_time
+            return self._remember(key, self._parse_response(response.choices[0].message.content, elapsed_time))
+        except Exception as e:
+            return self._failed(e)
     
     def to_dict(self) -> dict:
         """转换为字典"""
@@ -373,18 +550,11 @@ class RuleBasedEvaluator:
             "professionalism": 7.0
         }
         
-        mt_patterns = [
-            (r'的{3,}', '连续多个"的"', -1),
-            (r'了{3,}', '连续多个"了"', -1),
-            (r'是{3,}', '连续多个"是"', -1),
-            (r'我我我|你你你|他他他', '重复代词', -1.5),
-            (r'[，。、]{2,}', '连续标点', -0.5),
-        ]
-        
-        for pattern, desc, penalty in mt_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                issues.append(f"{desc}: {len(matches)}次")
+        mt_counts = Counter(m.lastgroup for m in _MT_RE.finditer(text))
+        for name, _, desc, penalty in _MT_PATTERNS:
+            count = mt_counts[name]
+            if count:
+                issues.append(f"{desc}: {count}次")
                 scores["fluency"] += penalty
         
         unnatural = ['打开灯', '关闭灯', '这是非常', '那是非常', '在这一点上']
@@ -393,15 +563,23 @@ class RuleBasedEvaluator:
                 issues.append(f"不自然表达: {phrase}")
                 scores["localization"] -= 1
         
-        chinese_chars = len(re.findall(r'[\u4e00-\u9fff]', text))
-        total_chars = len([c for c in text if not c.isspace()])
+        # 一次计数，再按字符种类汇总（不同字符的数量远小于文本长度）
+        char_counts = Counter(text)
+        chinese_chars = 0
+        total_chars = 0
+        for ch, n in char_counts.items():
+            if ch.isspace():
+                continue
+            total_chars += n
+            if '\u4e00' <= ch <= '\u9fff':
+                chinese_chars += n
         chinese_ratio = chinese_chars / total_chars if total_chars > 0 else 0
         
         if chinese_ratio < 0.5:
             scores["accuracy"] -= 2
             issues.append(f"中文比例过低: {chinese_ratio:.1%}")
         
-        punct_count = len(re.findall(r'[，。！？、]', text))
+        punct_count = sum(char_counts[c] for c in _PUNCT_CHARS)
         punct_ratio = punct_count / total_chars if total_chars > 0 else 0
         
         if punct_ratio < 0.01:
@@ -427,6 +605,19 @@ class RuleBasedEvaluator:
             issues=issues,
             summary="基于规则评估" + ("，疑似机器翻译" if is_mt else "")
         )
+    
+    async def evaluate_async(self, content: str, ext: str) -> QualityResult:
+        """与 AIEvaluator 保持一致的异步接口（规则评估本身是同步的纯计算）"""
+        return self.evaluate(content, ext)
+
+
+_RULE_EVALUATOR = RuleBasedEvaluator()
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_ai_evaluator(api_key: str, base_url: str, model: str) -> AIEvaluator:
+    """以配置值为键复用评估器；配置修改后键随之变化，无需手动失效"""
+    return AIEvaluator(api_key=api_key, base_url=base_url, model=model, enabled=True)
 
 
 def get_evaluator(config: dict) -> AIEvaluator | RuleBasedEvaluator:
@@ -434,11 +625,10 @@ def get_evaluator(config: dict) -> AIEvaluator | RuleBasedEvaluator:
     ai_config = config.get("ai_evaluator", {})
     
     if ai_config.get("enabled", False):
-        return AIEvaluator(
-            api_key=ai_config.get("api_key", ""),
-            base_url=ai_config.get("base_url", "https://api.deepseek.com"),
-            model=ai_config.get("model", "deepseek-chat"),
-            enabled=True
+        return _cached_ai_evaluator(
+            ai_config.get("api_key", ""),
+            ai_config.get("base_url", "https://api.deepseek.com"),
+            ai_config.get("model", "deepseek-chat"),
         )
     else:
-        return RuleBasedEvaluator()
+        return _RULE_EVALUATOR
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from thunder_subtitle_cli.models import ThunderSubtitleItem
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def default_memory_ttl() -> float:
+    try:
+        return float(os.environ.get("THUNDER_SEARCH_TTL", "600"))
+    except ValueError:
+        return 600.0
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get("THUNDER_SUBTITLE_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "thunder-subtitle" / "search"
+
+
+class SearchCache:
+    """
+    On-disk cache of parsed search results, one JSON file per (base_url, query).
+    Entries older than ttl_s are treated as missing.
+    """
+
+    def __init__(self, *, cache_dir: Path | None = None, ttl_s: float = 3600.0) -> None:
+        self._dir = cache_dir if cache_dir is not None else default_cache_dir()
+        self._ttl_s = ttl_s
+
+    def _path(self, *, base_url: str, query: str) -> Path:
+        key = hashlib.sha1(f"{base_url}\n{query}".encode("utf-8")).hexdigest()
+        return self._dir / f"{key}.json"
+
+    def get(self, *, base_url: str, query: str) -> list[ThunderSubtitleItem] | None:
+        path = self._path(base_url=base_url, query=query)
+        try:
+            if time.time() - path.stat().st_mtime > self._ttl_s:
+                return None
+            raw = _json_loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        return [ThunderSubtitleItem.from_dict(d) for d in raw]
+
+    def set(self, *, base_url: str, query: str, items: list[ThunderSubtitleItem]) -> None:
+        path = self._path(base_url=base_url, query=query)
+        tmp = path.with_suffix(".tmp")
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps([i.to_dict() for i in items], ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            # Caching is best-effort; a read-only home must not break searches.
+            pass
+
+
+class MemorySearchCache:
+    """
+    In-process counterpart of SearchCache for long-lived processes (TUI, web UI).
+    Queries are keyed after collapsing whitespace; expired entries are dropped on lookup
+    and only the max_entries most recently used queries are kept.
+    """
+
+    def __init__(self, *, ttl_s: float | None = None, max_entries: int = 64) -> None:
+        self._ttl_s = default_memory_ttl() if ttl_s is None else ttl_s
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, list[ThunderSubtitleItem]]] = OrderedDict()
+
+    @staticmethod
+    def _key(*, base_url: str, query: str) -> tuple[str, str]:
+        return base_url, " ".join(query.split())
+
+    def get(self, *, base_url: str, query: str) -> list[ThunderSubtitleItem] | None:
+        key = self._key(base_url=base_url, query=query)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, items = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return list(items)
+
+    def set(self, *, base_url: str, query: str, items: list[ThunderSubtitleItem]) -> None:
+        key = self._key(base_url=base_url, query=query)
+        self._entries[key] = (time.monotonic() + self._ttl_s, list(items))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
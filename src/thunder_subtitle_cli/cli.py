@@ -3,17 +3,10 @@ from __future__ import annotations
 import asyncio
 import json
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
-
-from thunder_subtitle_cli.client import ThunderClient, download_with_retries
-from thunder_subtitle_cli.core import apply_filters as _apply_filters
-from thunder_subtitle_cli.formatting import print_search_table, to_json
-from thunder_subtitle_cli.models import ThunderSubtitleItem
-from thunder_subtitle_cli.selector import InteractiveSelector, DeterministicSelector, Selector
+
 from thunder_subtitle_cli.util import (
     compute_item_id,
     ensure_unique_path,
@@ -22,10 +15,27 @@ from thunder_subtitle_cli.util import (
     sanitize_component,
 )
 
+# Heavier modules (httpx, rich, questionary) are imported inside the commands
+# that need them so `--help` and the TUI entry point start quickly.
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+    from thunder_subtitle_cli.client import ThunderClient
+    from thunder_subtitle_cli.models import ThunderSubtitleItem
+    from thunder_subtitle_cli.selector import Selector
+
 
 app = typer.Typer(add_completion=False, no_args_is_help=False)
 
 
+def _make_client(*, no_cache: bool, cache_ttl: float, max_connections: int | None = None) -> "ThunderClient":
+    from thunder_subtitle_cli.cache import SearchCache
+    from thunder_subtitle_cli.client import ThunderClient
+
+    cache = None if no_cache or cache_ttl <= 0 else SearchCache(ttl_s=cache_ttl)
+    return ThunderClient(cache=cache, max_connections=max_connections)
+
+
 @app.callback(invoke_without_command=True)
 def _main(ctx: typer.Context) -> None:
     # Default behavior: enter TUI when running in an interactive terminal.
@@ -58,17 +68,21 @@ def search(
     lang: Optional[str] = typer.Option(None, "--lang"),
     timeout: float = typer.Option(20.0, "--timeout"),
     json_out: bool = typer.Option(False, "--json"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always query the API, ignoring cached results."),
+    cache_ttl: float = typer.Option(3600.0, "--cache-ttl", min=0, help="Seconds a cached search result stays valid."),
 ) -> None:
     """
     搜索字幕（只列出结果，不下载）。
     """
+    from thunder_subtitle_cli.core import apply_filters as _apply_filters
+    from thunder_subtitle_cli.core import top_by_score
+    from thunder_subtitle_cli.formatting import print_search_table, to_json
 
     async def _run() -> list[ThunderSubtitleItem]:
-        client = ThunderClient()
-        items = await client.search(query=query, timeout_s=timeout)
-        items = sorted(items, key=lambda x: x.score, reverse=True)
+        async with _make_client(no_cache=no_cache, cache_ttl=cache_ttl) as client:
+            items = await client.search(query=query, timeout_s=timeout)
         items = _apply_filters(items, min_score=min_score, lang=lang)
-        return items[:limit]
+        return top_by_score(items, limit)
 
     items = asyncio.run(_run())
     if json_out:
@@ -92,25 +106,29 @@ def download(
     retries: int = typer.Option(2, "--retries", min=0, max=10),
     overwrite: bool = typer.Option(False, "--overwrite/--no-overwrite"),
     json_out: bool = typer.Option(False, "--json"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always query the API, ignoring cached results."),
+    cache_ttl: float = typer.Option(3600.0, "--cache-ttl", min=0, help="Seconds a cached search result stays valid."),
 ) -> None:
     """
     下载单个字幕（默认下载评分最高的一个）。
     """
+    from rich.console import Console
 
-    async def _run() -> dict:
-        client = ThunderClient()
+    from thunder_subtitle_cli.client import download_to_with_retries
+    from thunder_subtitle_cli.core import apply_filters as _apply_filters
+    from thunder_subtitle_cli.core import top_by_score
+
+    async def _run(client: ThunderClient) -> dict:
         items = await client.search(query=query, timeout_s=20.0)
-        items = sorted(items, key=lambda x: x.score, reverse=True)
-        items = _apply_filters(items, min_score=min_score, lang=lang)[:limit]
+        items = top_by_score(_apply_filters(items, min_score=min_score, lang=lang), limit)
         if not items:
             raise typer.Exit(code=2)
 
         chosen: ThunderSubtitleItem | None = None
         if id_:
-            for it in items:
-                if compute_item_id(gcid=it.gcid, cid=it.cid) == id_:
-                    chosen = it
-                    break
+            # Built from the end so that, like the old linear scan, the first duplicate wins.
+            id_map = {compute_item_id(gcid=it.gcid, cid=it.cid): it for it in reversed(items)}
+            chosen = id_map.get(id_)
         elif index is not None:
             if 0 <= index < len(items):
                 chosen = items[index]
@@ -127,14 +145,17 @@ def download(
         if not overwrite:
             path = ensure_unique_path(path)
 
-        data = await download_with_retries(client, url=chosen.url, timeout_s=timeout, retries=retries)
-        path.write_bytes(data)
+        await download_to_with_retries(client, url=chosen.url, path=path, timeout_s=timeout, retries=retries)
         return {
             "saved_path": str(path),
             "selected": {"id": compute_item_id(gcid=chosen.gcid, cid=chosen.cid), "name": chosen.name, "ext": chosen.ext, "score": chosen.score},
         }
 
-    res = asyncio.run(_run())
+    async def _main() -> dict:
+        async with _make_client(no_cache=no_cache, cache_ttl=cache_ttl) as client:
+            return await _run(client)
+
+    res = asyncio.run(_main())
     if json_out:
         typer.echo(json.dumps(res, ensure_ascii=False, indent=2))
         raise typer.Exit(code=0)
@@ -155,10 +176,19 @@ def batch(
     select: Optional[str] = typer.Option(None, "--select", help="Non-interactive selection, e.g. 1,3,5 or 1-4,9"),
     select_id: list[str] = typer.Option([], "--select-id", help="Non-interactive selection by id (repeatable)"),
     yes: bool = typer.Option(False, "--yes", help="Skip confirmation prompt (still requires a selection)."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always query the API, ignoring cached results."),
+    cache_ttl: float = typer.Option(3600.0, "--cache-ttl", min=0, help="Seconds a cached search result stays valid."),
 ) -> None:
     """
     批量交互式多选下载（每个 query 单独选择）。
     """
+    from rich.console import Console
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+    from thunder_subtitle_cli.client import download_to_with_retries
+    from thunder_subtitle_cli.core import apply_filters as _apply_filters
+    from thunder_subtitle_cli.core import top_by_score
+    from thunder_subtitle_cli.selector import DeterministicSelector, InteractiveSelector
 
     if interactive:
         if not is_tty():
@@ -170,15 +200,12 @@ def batch(
             raise typer.BadParameter("非交互模式需要 --select 或 --select-id。")
         selector = DeterministicSelector(indices=indices, ids=select_id)
 
-    client = ThunderClient()
+    # One pooled client for every search and download in this run.
+    client = _make_client(no_cache=no_cache, cache_ttl=cache_ttl, max_connections=concurrency * 2)
     console = Console()
-    total_ok = 0
-    total_fail = 0
-    all_errs: list[str] = []
 
     async def _search_one(q: str) -> list[ThunderSubtitleItem]:
         items_all = await client.search(query=q, timeout_s=20.0)
-        items_all = sorted(items_all, key=lambda x: x.score, reverse=True)
         return _apply_filters(items_all, min_score=min_score, lang=lang)
 
     async def _download_selected(
@@ -191,69 +218,95 @@ def batch(
     ) -> list[str]:
         sem = asyncio.Semaphore(concurrency)
         errs: list[str] = []
-
-        async def _one(it: ThunderSubtitleItem) -> None:
+        q_dir.mkdir(parents=True, exist_ok=True)
+        # Claim every target name before any download starts; checking inside the
+        # workers let two same-named items both pick the one free path.
+        paths: list[Path] = []
+        for it in selected_items:
+            safe_name = sanitize_component(it.name, max_len=120)
+            ext = sanitize_component(it.ext or "srt", max_len=10)
+            paths.append(ensure_unique_path(q_dir / f"{safe_name}.{ext}", reserved=paths))
+
+        async def _one(it: ThunderSubtitleItem, path: Path) -> Optional[str]:
             async with sem:
-                safe_name = sanitize_component(it.name, max_len=120)
-                ext = sanitize_component(it.ext or "srt", max_len=10)
-                q_dir.mkdir(parents=True, exist_ok=True)
-                path = ensure_unique_path(q_dir / f"{safe_name}.{ext}")
                 try:
-                    data = await download_with_retries(client, url=it.url, timeout_s=timeout, retries=retries)
-                    path.write_bytes(data)
+                    await download_to_with_retries(client, url=it.url, path=path, timeout_s=timeout, retries=retries)
                 except Exception as e:
-                    errs.append(f"{q}: {it.name}: {e}")
-                finally:
-                    progress.advance(task_id, 1)
-
-        await asyncio.gather(*[_one(i) for i in selected_items])
+                    return f"{q}: {it.name}: {e}"
+                return None
+
+        # Tick the progress bar as each file lands rather than when the whole batch is done.
+        for fut in asyncio.as_completed([_one(it, p) for it, p in zip(selected_items, paths)]):
+            err = await fut
+            if err is not None:
+                errs.append(err)
+            progress.advance(task_id, 1)
         return errs
 
-    for q in queries:
-        # Run network search outside the questionary prompt. (prompt-toolkit uses asyncio internally)
-        items_filtered = asyncio.run(_search_one(q))
-        found = len(items_filtered)
-        items = items_filtered[:limit]
-
-        console.print(f"搜索: {q} (匹配 {found}，显示 {len(items)})")
-
-        # IMPORTANT: keep this synchronous (questionary/prompt-toolkit starts its own event loop).
-        selected = selector.select(query=q, items=items)
-        selected_items = [s.item for s in selected]
-        if not selected_items:
-            console.print("  （未选择任何字幕）")
-            continue
-
-        safe_q = sanitize_component(q, max_len=80)
-        q_dir = out_dir / safe_q
-
-        if not yes and interactive:
-            ok = typer.confirm(f"下载 {len(selected_items)} 个字幕到 {q_dir}？", default=True)
-            if not ok:
-                console.print("  （已跳过）")
-                continue
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("{task.description}"),
-            BarColumn(),
-            TimeElapsedColumn(),
-            console=console,
-        ) as progress:
-            task_id = progress.add_task(f"Downloading {len(selected_items)} file(s)...", total=len(selected_items))
-            errs = asyncio.run(
-                _download_selected(
-                    q=q,
-                    q_dir=q_dir,
-                    selected_items=selected_items,
-                    progress=progress,
-                    task_id=task_id,
-                )
-            )
-
-        total_ok += len(selected_items) - len(errs)
-        total_fail += len(errs)
-        all_errs.extend(errs)
+    async def _run_all() -> tuple[int, int, list[str]]:
+        ok_count = 0
+        fail_count = 0
+        errs_all: list[str] = []
+        async with client:
+            pending: Optional[asyncio.Task[list[ThunderSubtitleItem]]] = None
+            try:
+                for i, q in enumerate(queries):
+                    items_filtered = await pending if pending is not None else await _search_one(q)
+                    pending = None
+                    found = len(items_filtered)
+                    items = top_by_score(items_filtered, limit)
+
+                    console.print(f"搜索: {q} (匹配 {found}，显示 {len(items)})")
+
+                    # Search the next query while the user is still choosing for this one.
+                    if i + 1 < len(queries):
+                        pending = asyncio.create_task(_search_one(queries[i + 1]))
+
+                    # questionary/prompt-toolkit starts its own event loop, so prompts run in a worker thread.
+                    selected = await asyncio.to_thread(selector.select, query=q, items=items)
+                    selected_items = [s.item for s in selected]
+                    if not selected_items:
+                        console.print("  （未选择任何字幕）")
+                        continue
+
+                    safe_q = sanitize_component(q, max_len=80)
+                    q_dir = out_dir / safe_q
+
+                    if not yes and interactive:
+                        ok = await asyncio.to_thread(
+                            typer.confirm, f"下载 {len(selected_items)} 个字幕到 {q_dir}？", default=True
+                        )
+                        if not ok:
+                            console.print("  （已跳过）")
+                            continue
+
+                    with Progress(
+                        SpinnerColumn(),
+                        TextColumn("{task.description}"),
+                        BarColumn(),
+                        TimeElapsedColumn(),
+                        console=console,
+                    ) as progress:
+                        task_id = progress.add_task(
+                            f"Downloading {len(selected_items)} file(s)...", total=len(selected_items)
+                        )
+                        errs = await _download_selected(
+                            q=q,
+                            q_dir=q_dir,
+                            selected_items=selected_items,
+                            progress=progress,
+                            task_id=task_id,
+                        )
+
+                    ok_count += len(selected_items) - len(errs)
+                    fail_count += len(errs)
+                    errs_all.extend(errs)
+            finally:
+                if pending is not None:
+                    pending.cancel()
+        return ok_count, fail_count, errs_all
+
+    total_ok, total_fail, all_errs = asyncio.run(_run_all())
 
     console.print(f"完成。成功={total_ok} 失败={total_fail}")
     if all_errs:
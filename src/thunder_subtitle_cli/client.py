@@ -1,40 +1,184 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.util
+import json
 from dataclasses import asdict
+from pathlib import Path
 from typing import Any, Iterable
 
 import httpx
 
+from thunder_subtitle_cli.cache import MemorySearchCache, SearchCache
 from thunder_subtitle_cli.models import ThunderSubtitleResponse, ThunderSubtitleItem
 
 
+# httpx only negotiates HTTP/2 when the optional h2 package is installed.
+_HAS_H2 = importlib.util.find_spec("h2") is not None
+
+_CHUNK_SIZE = 64 * 1024
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
 class ThunderAPIError(RuntimeError):
     pass
 
 
 class ThunderClient:
-    def __init__(self, *, base_url: str = "https://api-shoulei-ssl.xunlei.com") -> None:
+    def __init__(
+        self,
+        *,
+        base_url: str = "https://api-shoulei-ssl.xunlei.com",
+        cache: SearchCache | MemorySearchCache | None = None,
+        max_connections: int | None = None,
+    ) -> None:
         self._base_url = base_url.rstrip("/")
+        self._cache = cache
+        if max_connections is None:
+            self._limits = httpx.Limits()
+        else:
+            self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        # One pool per event loop: a shared client may be used from the server loop
+        # and from watcher threads that run their own loop at the same time. Each pool
+        # comes with a task that closes it when its loop winds down (see _close_with_loop).
+        self._sessions: dict[asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, asyncio.Task[None]]] = {}
+        # Searches still waiting on the network, so a repeat query joins the pending
+        # request instead of sending a second one.
+        self._inflight: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future[list[ThunderSubtitleItem]]] = {}
+
+    async def __aenter__(self) -> "ThunderClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _get_session(self) -> httpx.AsyncClient:
+        # Connection pools are bound to the loop that created them; callers that
+        # use asyncio.run() per action get a fresh pool for each new loop.
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(loop)
+        if entry is not None and not entry[0].is_closed:
+            return entry[0]
+        # Loops closed without cancelling their tasks (a bare loop.close()) never ran
+        # the closer; drop their pools so the sockets are released with them.
+        for stale in [l for l in self._sessions if l.is_closed()]:
+            del self._sessions[stale]
+        session = httpx.AsyncClient(
+            http2=_HAS_H2,
+            limits=self._limits,
+            timeout=httpx.Timeout(20.0),
+            follow_redirects=True,
+        )
+        closer = loop.create_task(self._close_with_loop(loop, session))
+        self._sessions[loop] = (session, closer)
+        return session
+
+    async def _close_with_loop(self, loop: asyncio.AbstractEventLoop, session: httpx.AsyncClient) -> None:
+        # asyncio.run() and asyncio.Runner cancel leftover tasks before closing the
+        # loop: the last moment the pool can still be closed on the loop that owns it.
+        try:
+            await loop.create_future()
+        finally:
+            entry = self._sessions.get(loop)
+            if entry is not None and entry[0] is session:
+                del self._sessions[loop]
+            await session.aclose()
+
+    async def aclose(self) -> None:
+        entry = self._sessions.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            session, closer = entry
+            closer.cancel()
+            await session.aclose()
+
+    async def prime(self, *, timeout_s: float = 5.0) -> None:
+        """
+        Open a pooled connection to the API host ahead of the first real request.
+        Failures are ignored: the request that follows reports them itself.
+        """
+        try:
+            await self._get_session().head(self._base_url, timeout=timeout_s)
+        except httpx.HTTPError:
+            pass
 
     async def search(self, *, query: str, timeout_s: float = 20.0) -> list[ThunderSubtitleItem]:
         if not query:
             return []
+        if self._cache is not None:
+            cached = self._cache.get(base_url=self._base_url, query=query)
+            if cached is not None:
+                return cached
+        # Same normalisation as MemorySearchCache, so spacing variants share one request.
+        key = (asyncio.get_running_loop(), " ".join(query.split()))
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._fetch(query=query, timeout_s=timeout_s))
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller giving up must not cancel the request for the others.
+        return list(await asyncio.shield(fut))
+
+    async def _fetch(self, *, query: str, timeout_s: float) -> list[ThunderSubtitleItem]:
         url = f"{self._base_url}/oracle/subtitle"
-        async with httpx.AsyncClient(timeout=timeout_s, follow_redirects=True) as client:
-            r = await client.get(url, params={"name": query})
-            r.raise_for_status()
-            data = r.json()
+        r = await self._get_session().get(url, params={"name": query}, timeout=timeout_s)
+        r.raise_for_status()
+        data = _json_loads(r.content)
         resp = ThunderSubtitleResponse.from_dict(data)
         if resp.code != 0 or resp.result != "ok":
             return []
+        # Empty results are not cached: subtitles for new releases show up later.
+        if self._cache is not None and resp.data:
+            self._cache.set(base_url=self._base_url, query=query, items=resp.data)
         return resp.data
 
     async def download_bytes(self, *, url: str, timeout_s: float = 60.0) -> bytes:
-        async with httpx.AsyncClient(timeout=timeout_s, follow_redirects=True) as client:
-            r = await client.get(url)
+        r = await self._get_session().get(url, timeout=timeout_s)
+        r.raise_for_status()
+        return r.content
+
+    async def download_prefix(self, *, url: str, max_bytes: int, timeout_s: float = 10.0) -> bytes:
+        """
+        First max_bytes of the body, for previews. Asks for a byte range and stops
+        reading early when the server ignores it and sends the whole file.
+        """
+        headers = {"Range": f"bytes=0-{max_bytes - 1}"}
+        buf = bytearray()
+        async with self._get_session().stream("GET", url, headers=headers, timeout=timeout_s) as r:
+            if r.status_code == 416:
+                # Range starts past the end: the file is empty.
+                return b""
             r.raise_for_status()
-            return r.content
+            async for chunk in r.aiter_bytes(_CHUNK_SIZE):
+                buf += chunk
+                if len(buf) >= max_bytes:
+                    break
+        return bytes(buf[:max_bytes])
+
+    async def download_to(self, *, url: str, path: Path, timeout_s: float = 60.0) -> int:
+        """
+        Stream the response body into path and return the number of bytes written.
+        The body goes to a sibling .part file first, so a failed download never
+        truncates an existing file.
+        """
+        part = path.with_name(path.name + ".part")
+        written = 0
+        try:
+            async with self._get_session().stream("GET", url, timeout=timeout_s) as r:
+                r.raise_for_status()
+                with part.open("wb") as f:
+                    async for chunk in r.aiter_bytes(_CHUNK_SIZE):
+                        f.write(chunk)
+                        written += len(chunk)
+            part.replace(path)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+        return written
 
 
 async def download_with_retries(
@@ -55,3 +199,24 @@ async def download_with_retries(
                 break
             await asyncio.sleep(retry_sleep_s * (attempt + 1))
     raise ThunderAPIError(f"下载失败（已重试 {retries} 次）：{last_err}") from last_err
+
+
+async def download_to_with_retries(
+    client: ThunderClient,
+    *,
+    url: str,
+    path: Path,
+    timeout_s: float,
+    retries: int,
+    retry_sleep_s: float = 0.5,
+) -> int:
+    last_err: Exception | None = None
+    for attempt in range(retries + 1):
+        try:
+            return await client.download_to(url=url, path=path, timeout_s=timeout_s)
+        except (httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError) as e:
+            last_err = e
+            if attempt >= retries:
+                break
+            await asyncio.sleep(retry_sleep_s * (attempt + 1))
+    raise ThunderAPIError(f"下载失败（已重试 {retries} 次）：{last_err}") from last_err
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 from dataclasses import asdict
 from pathlib import Path
 from typing import Optional
 
-from thunder_subtitle_cli.client import ThunderClient, download_with_retries
+from thunder_subtitle_cli.cache import MemorySearchCache
+from thunder_subtitle_cli.client import ThunderClient, download_to_with_retries
 from thunder_subtitle_cli.models import ThunderSubtitleItem
 from thunder_subtitle_cli.util import ensure_unique_path, sanitize_component
 
@@ -16,12 +18,22 @@ def apply_filters(
     min_score: Optional[float] = None,
     lang: Optional[str] = None,
 ) -> list[ThunderSubtitleItem]:
-    out = items
-    if min_score is not None:
-        out = [i for i in out if i.score >= min_score]
-    if lang:
-        out = [i for i in out if lang in (i.languages or [])]
-    return out
+    # One pass with the combined predicate instead of one list per filter.
+    if min_score is None:
+        if not lang:
+            return items
+        return [i for i in items if lang in (i.languages or ())]
+    if not lang:
+        return [i for i in items if i.score >= min_score]
+    return [i for i in items if i.score >= min_score and lang in (i.languages or ())]
+
+
+def top_by_score(items: list[ThunderSubtitleItem], limit: int) -> list[ThunderSubtitleItem]:
+    """
+    Highest-scoring items first, at most limit of them.
+    Same order as a stable sort by score descending, without sorting the whole list.
+    """
+    return heapq.nlargest(limit, items, key=lambda x: x.score)
 
 
 def format_item_label(item: ThunderSubtitleItem) -> str:
@@ -38,6 +50,21 @@ def resolve_out_dir(input_str: str | None, *, default: str = "./subs") -> Path:
     return Path(s).expanduser()
 
 
+_shared_client: ThunderClient | None = None
+
+
+def get_client() -> ThunderClient:
+    """
+    Process-wide ThunderClient, so searches and downloads reuse pooled keep-alive
+    connections instead of paying a TCP+TLS handshake per request.
+    Repeat searches within THUNDER_SEARCH_TTL seconds (default 600) are served from memory.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = ThunderClient(cache=MemorySearchCache())
+    return _shared_client
+
+
 async def search_items(
     *,
     query: str,
@@ -46,11 +73,10 @@ async def search_items(
     lang: Optional[str] = None,
     timeout_s: float = 20.0,
 ) -> list[ThunderSubtitleItem]:
-    client = ThunderClient()
+    client = get_client()
     items = await client.search(query=query, timeout_s=timeout_s)
-    items = sorted(items, key=lambda x: x.score, reverse=True)
     items = apply_filters(items, min_score=min_score, lang=lang)
-    return items[:limit]
+    return top_by_score(items, limit)
 
 
 async def download_item(
@@ -61,16 +87,51 @@ async def download_item(
     retries: int = 2,
     overwrite: bool = False,
 ) -> Path:
-    client = ThunderClient()
-
-    safe_name = sanitize_component(item.name, max_len=120)
-    ext = sanitize_component(item.ext or "srt", max_len=10)
     out_dir.mkdir(parents=True, exist_ok=True)
-    path = out_dir / f"{safe_name}.{ext}"
+    path = _item_path(item, out_dir)
     if not overwrite:
         path = ensure_unique_path(path)
 
-    data = await download_with_retries(client, url=item.url, timeout_s=timeout_s, retries=retries)
-    path.write_bytes(data)
+    await download_to_with_retries(get_client(), url=item.url, path=path, timeout_s=timeout_s, retries=retries)
     return path
 
+
+async def download_items(
+    *,
+    items: list[ThunderSubtitleItem],
+    out_dir: Path,
+    concurrency: int = 8,
+    timeout_s: float = 60.0,
+    retries: int = 2,
+    overwrite: bool = False,
+) -> list[Path | BaseException]:
+    """
+    Download several items at once over the shared client.
+    Results are in the order of items; a failed download yields its exception.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Pick every target name up front: files only appear once their download
+    # finishes, so concurrent items with the same name would otherwise collide.
+    paths: list[Path] = []
+    for it in items:
+        path = _item_path(it, out_dir)
+        if not overwrite:
+            path = ensure_unique_path(path, reserved=paths)
+        paths.append(path)
+
+    client = get_client()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(it: ThunderSubtitleItem, path: Path) -> Path:
+        async with sem:
+            await download_to_with_retries(client, url=it.url, path=path, timeout_s=timeout_s, retries=retries)
+            return path
+
+    return await asyncio.gather(*[_one(it, p) for it, p in zip(items, paths)], return_exceptions=True)
+
+
+def _item_path(item: ThunderSubtitleItem, out_dir: Path) -> Path:
+    safe_name = sanitize_component(item.name, max_len=120)
+    ext = sanitize_component(item.ext or "srt", max_len=10)
+    return out_dir / f"{safe_name}.{ext}"
+
@@ -5,7 +5,9 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import os
+from collections import OrderedDict, deque
 import re
 import threading
 import time
@@ -32,6 +34,7 @@ class WatchDirectory:
     ])
     output_dir: str = ""
     use_ai: bool = False
+    debounce_s: float = 0.5
 
 
 @dataclass
@@ -45,53 +48,125 @@ class WatcherEvent:
 
 
 class VideoFileHandler(FileSystemEventHandler):
-    """视频文件事件处理器"""
+    """视频文件事件处理器
+    
+    事件先写入待处理表，目录安静 debounce_s 秒后再统一检查文件大小是否稳定，
+    把一批去重后的新文件一次性交给 on_new_file
+    """
+    
+    MAX_PROCESSED_FILES = 4096
     
     def __init__(
         self,
         watch_dir: WatchDirectory,
-        on_new_file: Callable[[str, WatchDirectory], None],
+        on_new_file: Callable[[List[str], WatchDirectory], None],
         file_types: List[str]
     ):
         super().__init__()
         self.watch_dir = watch_dir
         self.on_new_file = on_new_file
-        self.file_types = [ft.lower() for ft in file_types]
-        self._processed_files = set()
+        self.file_types = frozenset(ft.lower() for ft in file_types)
+        self.debounce_s = watch_dir.debounce_s
+        # (路径, mtime_ns) -> None，按最近使用顺序保留，超出上限时淘汰最旧的
+        self._processed_files: OrderedDict[tuple[str, int], None] = OrderedDict()
+        # realpath -> (首次看到时的路径, 上次记录的文件大小)
+        self._pending: Dict[str, tuple[str, int]] = {}
+        self._last_event = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._closed = False
     
     def on_created(self, event):
         if event.is_directory:
             return
         
-        file_path = event.src_path
-        ext = os.path.splitext(file_path)[1].lower()
-        
-        if ext not in self.file_types:
-            return
-        
-        file_key = f"{file_path}_{os.path.getmtime(file_path) if os.path.exists(file_path) else 0}"
-        
-        if file_key in self._processed_files:
+        if self._is_video(event.src_path):
+            self._enqueue(event.src_path)
+    
+    def on_moved(self, event):
+        # rsync 等工具先写临时文件再重命名为最终文件名
+        if event.is_directory:
             return
         
-        time.sleep(2)
-        
-        if not os.path.exists(file_path):
+        if self._is_video(event.dest_path):
+            self._enqueue(event.dest_path)
+    
+    def on_modified(self, event):
+        # 大文件复制过程中会持续产生修改事件，只用来推迟已在队列中的文件
+        if event.is_directory or not self._is_video(event.src_path):
             return
-        
-        try:
-            while True:
+        with self._lock:
+            if os.path.realpath(event.src_path) in self._pending:
+                self._last_event = time.monotonic()
+    
+    def _is_video(self, file_path: str) -> bool:
+        return os.path.splitext(file_path)[1].lower() in self.file_types
+    
+    def close(self):
+        """停止监控时取消尚未触发的定时器"""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+    
+    def _enqueue(self, file_path: str):
+        key = os.path.realpath(file_path)
+        with self._lock:
+            if self._closed:
+                return
+            if key not in self._pending:
+                self._pending[key] = (file_path, -1)
+            self._last_event = time.monotonic()
+            if self._timer is None:
+                self._arm(self.debounce_s)
+    
+    def _arm(self, delay: float):
+        # 调用方需持有 self._lock
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _on_timer(self):
+        with self._lock:
+            if self._closed:
+                return
+            # 定时器期间又有新事件：顺延到最后一次事件之后，而不是每个事件新建一个定时器
+            remaining = self._last_event + self.debounce_s - time.monotonic()
+            if remaining > 0:
+                self._arm(remaining)
+                return
+            
+            ready: List[str] = []
+            for key, (file_path, last_size) in list(self._pending.items()):
                 try:
-                    with open(file_path, 'rb') as f:
-                        f.read(1)
-                    break
-                except (IOError, PermissionError):
-                    time.sleep(1)
-        except Exception:
-            return
+                    st = os.stat(file_path)
+                except OSError:
+                    # 文件已被删除或移走
+                    del self._pending[key]
+                    continue
+                if st.st_size != last_size:
+                    # 与上次采样的大小不同，说明还在写入，下一轮再看
+                    self._pending[key] = (file_path, st.st_size)
+                    continue
+                del self._pending[key]
+                file_key = (file_path, st.st_mtime_ns)
+                if file_key in self._processed_files:
+                    self._processed_files.move_to_end(file_key)
+                    continue
+                self._processed_files[file_key] = None
+                if len(self._processed_files) > self.MAX_PROCESSED_FILES:
+                    self._processed_files.popitem(last=False)
+                ready.append(file_path)
+            
+            if self._pending:
+                self._arm(self.debounce_s)
+            else:
+                self._timer = None
         
-        self._processed_files.add(file_key)
-        self.on_new_file(file_path, self.watch_dir)
+        if ready:
+            self.on_new_file(ready, self.watch_dir)
 
 
 class DirectoryWatcher:
@@ -106,17 +181,20 @@ class DirectoryWatcher:
         self._observers: Dict[str, Observer] = {}
         self._watch_dirs: Dict[str, WatchDirectory] = {}
         self._event_callback: Optional[Callable[[WatcherEvent], None]] = None
-        self._process_callback: Optional[Callable[[str, WatchDirectory], None]] = None
+        self._process_callback: Optional[Callable[[List[str], WatchDirectory], None]] = None
+        self._handlers: Dict[str, VideoFileHandler] = {}
         self._running = False
-        self._event_log: List[WatcherEvent] = []
+        # 处理回调所在的事件循环，由 start_async() 记录；监控线程通过它提交协程
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event_log: deque[WatcherEvent] = deque(maxlen=500)
         self._lock = threading.Lock()
     
     def set_event_callback(self, callback: Callable[[WatcherEvent], None]):
         """设置事件回调"""
         self._event_callback = callback
     
-    def set_process_callback(self, callback: Callable[[str, WatchDirectory], None]):
-        """设置处理回调"""
+    def set_process_callback(self, callback: Callable[[List[str], WatchDirectory], None]):
+        """设置处理回调（每次传入一批新文件路径）"""
         self._process_callback = callback
     
     def is_available(self) -> bool:
@@ -187,6 +265,7 @@ class DirectoryWatcher:
                 "file_types": watch_dir.file_types,
                 "output_dir": watch_dir.output_dir,
                 "use_ai": watch_dir.use_ai,
+                "debounce_s": watch_dir.debounce_s,
                 "is_watching": path in self._observers
             })
         return result
@@ -209,6 +288,14 @@ class DirectoryWatcher:
         self._log_event("start", "", "success", "目录监控已启动")
         return True
     
+    async def start_async(self):
+        """在事件循环中启动监控：记录当前循环，之后的协程回调都提交到该循环执行
+        
+        异步处理回调的调用方应使用此方法而不是 start()
+        """
+        self._loop = asyncio.get_running_loop()
+        return self.start()
+    
     def stop(self):
         """停止监控"""
         if not self._running:
@@ -228,7 +315,7 @@ class DirectoryWatcher:
     def get_event_log(self, limit: int = 50) -> List[Dict[str, Any]]:
         """获取事件日志"""
         with self._lock:
-            events = self._event_log[-limit:]
+            events = list(self._event_log)[-limit:]
             return [
                 {
                     "event_type": e.event_type,
@@ -256,6 +343,7 @@ class DirectoryWatcher:
         observer.start()
         
         self._observers[path] = observer
+        self._handlers[path] = handler
         self._log_event("watch", path, "success", f"开始监控目录: {path}")
     
     def _stop_observer(self, path: str):
@@ -266,33 +354,42 @@ class DirectoryWatcher:
         observer = self._observers[path]
         observer.stop()
         observer.join(timeout=5)
+        self._handlers.pop(path).close()
         
         del self._observers[path]
         self._log_event("unwatch", path, "success", f"停止监控目录: {path}")
     
-    def _on_new_file(self, file_path: str, watch_dir: WatchDirectory):
-        """处理新文件事件"""
-        self._log_event("new_file", file_path, "pending", f"检测到新文件: {os.path.basename(file_path)}")
+    def _on_new_file(self, file_paths: List[str], watch_dir: WatchDirectory):
+        """处理一批新文件事件"""
+        for file_path in file_paths:
+            self._log_event("new_file", file_path, "pending", f"检测到新文件: {os.path.basename(file_path)}")
         
         if self._process_callback:
             try:
-                import asyncio
                 if asyncio.iscoroutinefunction(self._process_callback):
-                    try:
-                        loop = asyncio.get_event_loop()
-                        if loop.is_running():
-                            asyncio.run_coroutine_threadsafe(
-                                self._process_callback(file_path, watch_dir),
-                                loop
-                            )
-                        else:
-                            asyncio.run(self._process_callback(file_path, watch_dir))
-                    except RuntimeError:
-                        asyncio.run(self._process_callback(file_path, watch_dir))
+                    coro = self._process_callback(file_paths, watch_dir)
+                    if self._loop is not None:
+                        # 提交到主循环，复用其中的连接池，不在监控线程里新建事件循环
+                        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+                        future.add_done_callback(lambda f: self._log_batch_failure(f, file_paths))
+                    else:
+                        # 未通过 start_async() 启动：在监控线程中单独运行
+                        asyncio.run(coro)
                 else:
-                    self._process_callback(file_path, watch_dir)
+                    self._process_callback(file_paths, watch_dir)
             except Exception as e:
-                self._log_event("error", file_path, "error", f"处理文件失败: {str(e)}")
+                for file_path in file_paths:
+                    self._log_event("error", file_path, "error", f"处理文件失败: {str(e)}")
+    
+    def _log_batch_failure(self, future: concurrent.futures.Future, file_paths: List[str]):
+        """提交到主循环的处理任务结束后检查异常，否则错误会被静默丢弃"""
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None:
+            return
+        for file_path in file_paths:
+            self._log_event("error", file_path, "error", f"处理文件失败: {str(exc)}")
     
     def _log_event(self, event_type: str, file_path: str, status: str, message: str):
         """记录事件日志"""
@@ -306,8 +403,6 @@ class DirectoryWatcher:
         
         with self._lock:
             self._event_log.append(event)
-            if len(self._event_log) > 500:
-                self._event_log = self._event_log[-500:]
         
         if self._event_callback:
             try:
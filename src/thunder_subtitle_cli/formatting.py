@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict
 from typing import Sequence
 
 from rich.console import Console
@@ -10,8 +9,22 @@ from rich.table import Table
 from thunder_subtitle_cli.models import ThunderSubtitleItem
 from thunder_subtitle_cli.util import compute_item_id
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def print_search_table(items: Sequence[ThunderSubtitleItem]) -> None:
+
+def annotate_items(items: Sequence[ThunderSubtitleItem]) -> list[str]:
+    """
+    Stable IDs for items, in order; compute once and pass to print_search_table / to_json.
+    """
+    return [compute_item_id(gcid=it.gcid, cid=it.cid) for it in items]
+
+
+def print_search_table(items: Sequence[ThunderSubtitleItem], ids: Sequence[str] | None = None) -> None:
+    if ids is None:
+        ids = annotate_items(items)
     table = Table(title="迅雷字幕列表")
     table.add_column("序号", justify="right")
     table.add_column("评分", justify="right")
@@ -20,8 +33,7 @@ def print_search_table(items: Sequence[ThunderSubtitleItem]) -> None:
     table.add_column("备注")
     table.add_column("语言")
     table.add_column("ID")
-    for idx, it in enumerate(items):
-        _id = compute_item_id(gcid=it.gcid, cid=it.cid)
+    for idx, (it, _id) in enumerate(zip(items, ids)):
         table.add_row(
             str(idx),
             f"{it.score:0.2f}",
@@ -34,10 +46,14 @@ def print_search_table(items: Sequence[ThunderSubtitleItem]) -> None:
     Console().print(table)
 
 
-def to_json(items: Sequence[ThunderSubtitleItem]) -> str:
+def to_json(items: Sequence[ThunderSubtitleItem], ids: Sequence[str] | None = None) -> str:
+    if ids is None:
+        ids = annotate_items(items)
     payload = []
-    for it in items:
-        d = asdict(it)
-        d["id"] = compute_item_id(gcid=it.gcid, cid=it.cid)
+    for it, _id in zip(items, ids):
+        d = it.to_dict()
+        d["id"] = _id
         payload.append(d)
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
     return json.dumps(payload, ensure_ascii=False, indent=2)
@@ -36,6 +36,23 @@ class ThunderSubtitleItem:
             mt=int(d.get("mt", 0) or 0),
         )
 
+    def to_dict(self) -> dict[str, Any]:
+        # Shallow on purpose (unlike dataclasses.asdict): callers only serialize the result.
+        return {
+            "gcid": self.gcid,
+            "cid": self.cid,
+            "url": self.url,
+            "ext": self.ext,
+            "name": self.name,
+            "duration": self.duration,
+            "languages": self.languages,
+            "source": self.source,
+            "score": self.score,
+            "fingerprintf_score": self.fingerprintf_score,
+            "extra_name": self.extra_name,
+            "mt": self.mt,
+        }
+
 
 @dataclass(frozen=True, slots=True)
 class ThunderSubtitleResponse:
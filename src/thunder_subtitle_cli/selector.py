@@ -39,22 +39,22 @@ class InteractiveSelector:
         ACTION_NONE = "__none__"
         ACTION_INVERT = "__invert__"
 
+        # Build the choice list once; re-prompts after an action only flip `checked`.
+        item_choices: list[questionary.Choice] = [
+            questionary.Choice(title=labels[_id], value=_id, checked=False) for _id in ordered_ids
+        ]
+        choices: list[questionary.Choice] = [
+            questionary.Choice(title="(跳过本次)", value=ACTION_SKIP, checked=False),
+            questionary.Choice(title="(全选)", value=ACTION_ALL, checked=False),
+            questionary.Choice(title="(全不选)", value=ACTION_NONE, checked=False),
+            questionary.Choice(title="(反选)", value=ACTION_INVERT, checked=False),
+            *item_choices,
+        ]
+
         checked: set[str] = set()
         while True:
-            choices: list[questionary.Choice] = [
-                questionary.Choice(title="(跳过本次)", value=ACTION_SKIP, checked=False),
-                questionary.Choice(title="(全选)", value=ACTION_ALL, checked=False),
-                questionary.Choice(title="(全不选)", value=ACTION_NONE, checked=False),
-                questionary.Choice(title="(反选)", value=ACTION_INVERT, checked=False),
-            ]
-            for _id in ordered_ids:
-                choices.append(
-                    questionary.Choice(
-                        title=labels[_id],
-                        value=_id,
-                        checked=_id in checked,
-                    )
-                )
+            for c in item_choices:
+                c.checked = c.value in checked
 
             answer = questionary.checkbox(
                 f"搜索: {query} (空格勾选，回车确认)",
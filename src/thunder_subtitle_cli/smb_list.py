@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import atexit
 import os
 import re
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
 from smb.SMBConnection import SMBConnection
+from smb.base import NotConnectedError, SMBTimeout
+from smb.smb_structs import OperationFailure
 
 
 _EP_RE = re.compile(r"^第(?P<num>\d{4})话\s+.*\.mp4$", re.IGNORECASE)
+_PATH_SEP_RE = re.compile(r"[\\/]+")
+
+# Authenticated connections reused across smb_listdir calls, keyed by everything that goes into the login.
+# _SMB_POOL_LOCK guards the dict; each connection carries its own lock because pysmb's blocking
+# SMBConnection is not thread-safe and concurrent calls would interleave on one socket.
+_SMB_POOL: dict[tuple[str, int, str, str], tuple[SMBConnection, threading.Lock]] = {}
+_SMB_POOL_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True, slots=True)
@@ -34,19 +45,19 @@ def extract_episode_num(name: str) -> int | None:
 
 
 def filter_and_sort_episode_files(names: Iterable[str]) -> list[str]:
-    out: list[str] = []
+    # Match each name once and keep the episode number for sorting.
+    pairs: list[tuple[int, str]] = []
     for n in names:
-        if n.strip() == ".git":
+        s = n.strip()
+        if s == ".git":
             continue
-        if match_episode_filename(n):
-            out.append(n.strip())
+        m = _EP_RE.match(s)
+        if m:
+            pairs.append((int(m.group("num")), s))
 
     # Sort by episode number (ascending), then by full filename.
-    def _key(x: str) -> tuple[int, str]:
-        num = extract_episode_num(x)
-        return (num if num is not None else 10**9, x)
-
-    return sorted(out, key=_key)
+    pairs.sort()
+    return [s for _, s in pairs]
 
 
 def default_output_path(project_root: Path) -> Path:
@@ -76,7 +87,7 @@ def load_config(*, project_root: Path) -> SmbConfig:
 
 def build_unc_dir(*, host: str, share: str, dir_path: str) -> str:
     # smbclient expects an UNC path like \\server\\share\\path
-    parts = [p for p in re.split(r"[\\/]+", dir_path) if p]
+    parts = [p for p in _PATH_SEP_RE.split(dir_path) if p]
     tail = "\\".join(parts)
     if tail:
         return f"\\\\{host}\\{share}\\{tail}"
@@ -85,10 +96,67 @@ def build_unc_dir(*, host: str, share: str, dir_path: str) -> str:
 
 def normalize_share_path(dir_path: str) -> str:
     # pysmb expects POSIX-like paths within a share.
-    parts = [p for p in re.split(r"[\\/]+", dir_path) if p]
+    parts = [p for p in _PATH_SEP_RE.split(dir_path) if p]
     return "/" + "/".join(parts) if parts else "/"
 
 
+def _connect(*, host: str, port: int, user: str, password: str) -> SMBConnection:
+    conn = SMBConnection(
+        user,
+        password,
+        "thunder-subtitle-cli",
+        host,
+        use_ntlm_v2=True,
+        is_direct_tcp=True,
+    )
+    ok = conn.connect(host, port)
+    if not ok:
+        raise RuntimeError(f"SMB connect failed: host={host} port={port}")
+    return conn
+
+
+def _pooled_connection(*, host: str, port: int, user: str, password: str) -> tuple[SMBConnection, threading.Lock]:
+    key = (host, port, user, password)
+    with _SMB_POOL_LOCK:
+        entry = _SMB_POOL.get(key)
+        if entry is None:
+            entry = (_connect(host=host, port=port, user=user, password=password), threading.Lock())
+            _SMB_POOL[key] = entry
+        return entry
+
+
+def _evict(entry: tuple[SMBConnection, threading.Lock], *, host: str, port: int, user: str, password: str) -> None:
+    key = (host, port, user, password)
+    with _SMB_POOL_LOCK:
+        # Another thread may already have replaced the broken connection.
+        if _SMB_POOL.get(key) is entry:
+            del _SMB_POOL[key]
+    conn, lock = entry
+    with lock:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def close_smb_pool() -> None:
+    """
+    Close every pooled SMB connection. Registered with atexit; safe to call more than once.
+    """
+    with _SMB_POOL_LOCK:
+        entries = list(_SMB_POOL.values())
+        _SMB_POOL.clear()
+    for conn, lock in entries:
+        with lock:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+atexit.register(close_smb_pool)
+
+
 def smb_listdir(
     *,
     host: str,
@@ -100,21 +168,26 @@ def smb_listdir(
 ) -> list[str]:
     """
     List entries in an SMB share directory using pysmb.
+    The authenticated session is pooled and reused by later calls with the same login;
+    calls sharing a session are serialised on its lock.
     """
     share_path = normalize_share_path(dir_path)
-    conn = SMBConnection(
-        user,
-        password,
-        "thunder-subtitle-cli",
-        host,
-        use_ntlm_v2=True,
-        is_direct_tcp=True,
-    )
-    ok = conn.connect(host, port)
-    if not ok:
-        raise RuntimeError(f"SMB connect failed: host={host} port={port}")
+    for attempt in range(2):
+        entry = _pooled_connection(host=host, port=port, user=user, password=password)
+        conn, lock = entry
+        try:
+            with lock:
+                files = conn.listPath(share, share_path)
+            break
+        except OperationFailure:
+            # The server refused the request (missing directory, access denied); the session is fine.
+            raise
+        except (NotConnectedError, SMBTimeout, OSError):
+            # The pooled session may have been dropped by the server; reconnect once.
+            _evict(entry, host=host, port=port, user=user, password=password)
+            if attempt:
+                raise
 
-    files = conn.listPath(share, share_path)
     names: list[str] = []
     for f in files:
         if f.filename in (".", ".."):
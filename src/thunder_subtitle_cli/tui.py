@@ -2,22 +2,42 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import Any, Coroutine, Optional, TypeVar
 
 import questionary
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 
-from thunder_subtitle_cli.core import format_item_label, resolve_out_dir, search_items
+from thunder_subtitle_cli.core import (
+    apply_filters,
+    format_item_label,
+    get_client,
+    resolve_out_dir,
+    search_items,
+    top_by_score,
+)
 from thunder_subtitle_cli.formatting import print_search_table
 from thunder_subtitle_cli.models import ThunderSubtitleItem
 from thunder_subtitle_cli.selector import InteractiveSelector
 from thunder_subtitle_cli.util import ensure_unique_path, sanitize_component
-from thunder_subtitle_cli.client import ThunderClient, download_with_retries
+from thunder_subtitle_cli.client import download_to_with_retries
 
 
 console = Console()
 
+T = TypeVar("T")
+
+# One event loop for the whole menu session, so the shared client's connection pool
+# stays warm between actions. Prompts run between (never inside) these calls:
+# questionary's ask() starts its own loop and needs none to be running.
+_runner: asyncio.Runner | None = None
+
+
+def _run(aw: Coroutine[Any, Any, T]) -> T:
+    if _runner is None:
+        return asyncio.run(aw)
+    return _runner.run(aw)
+
 
 def _ask_text(prompt: str, *, default: str | None = None) -> str | None:
     q = questionary.text(prompt, default=default) if default is not None else questionary.text(prompt)
@@ -49,8 +69,31 @@ def _ask_int(prompt: str, *, default: int) -> int | None:
 
 
 def run_tui() -> None:
+    global _runner
+    with asyncio.Runner() as runner:
+        _runner = runner
+        try:
+            _menu_loop()
+        finally:
+            _runner = None
+            runner.run(get_client().aclose())
+
+
+async def _ask_while_warming(question: questionary.Question) -> Any:
+    # DNS + TCP + TLS to the API host happen while the user reads the menu,
+    # not after they pick the first action.
+    warm = asyncio.ensure_future(get_client().prime())
+    try:
+        return await question.ask_async()
+    finally:
+        if not warm.done():
+            warm.cancel()
+
+
+def _menu_loop() -> None:
+    first = True
     while True:
-        choice = questionary.select(
+        question = questionary.select(
             "迅雷字幕 - 功能菜单",
             choices=[
                 "搜索字幕",
@@ -58,7 +101,10 @@ def run_tui() -> None:
                 "批量下载",
                 "退出",
             ],
-        ).ask()
+        )
+        # Only the first prompt runs on the session loop: later ones find the pool warm.
+        choice = _run(_ask_while_warming(question)) if first else question.ask()
+        first = False
         if choice is None or choice == "退出":
             return
         if choice == "搜索字幕":
@@ -88,7 +134,7 @@ def tui_search_flow() -> None:
         return
     lang_v = lang.strip() or None
 
-    items = asyncio.run(search_items(query=query.strip(), limit=limit, min_score=min_score_v, lang=lang_v))
+    items = _run(search_items(query=query.strip(), limit=limit, min_score=min_score_v, lang=lang_v))
     print_search_table(items)
 
     if not items:
@@ -106,16 +152,13 @@ def tui_search_flow() -> None:
 
 
 def _select_one(items: list[ThunderSubtitleItem]) -> ThunderSubtitleItem | None:
-    id_map: dict[str, ThunderSubtitleItem] = {}
-    choices: list[questionary.Choice] = [questionary.Choice(title="(返回)", value="__back__")]
-    for it in items:
-        _id = f"{it.gcid}:{it.cid}"
-        id_map[_id] = it
-        choices.append(questionary.Choice(title=format_item_label(it), value=_id))
+    # Choice values are list positions; -1 is the back entry.
+    choices: list[questionary.Choice] = [questionary.Choice(title="(返回)", value=-1)]
+    choices.extend(questionary.Choice(title=format_item_label(it), value=i) for i, it in enumerate(items))
     picked = questionary.select("请选择一个字幕：", choices=choices).ask()
-    if not picked or picked == "__back__":
+    if picked is None or picked == -1:
         return None
-    return id_map.get(str(picked))
+    return items[picked]
 
 
 def tui_download_from_items(items: list[ThunderSubtitleItem], *, default_query: str | None = None) -> None:
@@ -128,17 +171,16 @@ def tui_download_from_items(items: list[ThunderSubtitleItem], *, default_query:
         return
     out_dir = resolve_out_dir(out_dir_s, default="./subs")
 
-    async def _run() -> Path:
-        client = ThunderClient()
+    async def _download() -> Path:
+        client = get_client()
         safe_name = sanitize_component(chosen.name, max_len=120)
         ext = sanitize_component(chosen.ext or "srt", max_len=10)
         out_dir.mkdir(parents=True, exist_ok=True)
         path = ensure_unique_path(out_dir / f"{safe_name}.{ext}")
-        data = await download_with_retries(client, url=chosen.url, timeout_s=60.0, retries=2)
-        path.write_bytes(data)
+        await download_to_with_retries(client, url=chosen.url, path=path, timeout_s=60.0, retries=2)
         return path
 
-    path = asyncio.run(_run())
+    path = _run(_download())
     console.print(f"已保存：{path}")
     questionary.confirm("返回菜单？", default=True).ask()
 
@@ -152,8 +194,8 @@ def tui_download_flow() -> None:
     if limit is None:
         return
 
-    items = asyncio.run(search_items(query=query.strip(), limit=limit))
-    print_search_table(items)
+    # No table here: the picker that follows lists every result itself.
+    items = _run(search_items(query=query.strip(), limit=limit))
     if not items:
         questionary.confirm("没有结果，返回菜单？", default=True).ask()
         return
@@ -207,7 +249,7 @@ def tui_batch_flow() -> None:
         return
 
     selector = InteractiveSelector()
-    client = ThunderClient()
+    client = get_client()
 
     total_ok = 0
     total_fail = 0
@@ -215,10 +257,17 @@ def tui_batch_flow() -> None:
 
     async def _search(q: str) -> list[ThunderSubtitleItem]:
         items = await client.search(query=q, timeout_s=20.0)
-        items = sorted(items, key=lambda x: x.score, reverse=True)
-        from thunder_subtitle_cli.core import apply_filters
+        return top_by_score(apply_filters(items, min_score=min_score, lang=lang), limit)
 
-        return apply_filters(items, min_score=min_score, lang=lang)[:limit]
+    async def _search_all() -> list[list[ThunderSubtitleItem] | BaseException]:
+        # Queries are independent: run the searches together, then walk the prompts in order.
+        sem = asyncio.BoundedSemaphore(max(1, concurrency))
+
+        async def _bounded(q: str) -> list[ThunderSubtitleItem]:
+            async with sem:
+                return await _search(q)
+
+        return await asyncio.gather(*[_bounded(q) for q in queries], return_exceptions=True)
 
     async def _download_selected(
         *,
@@ -230,28 +279,42 @@ def tui_batch_flow() -> None:
     ) -> list[str]:
         sem = asyncio.Semaphore(concurrency)
         errs: list[str] = []
-
-        async def _one(it: ThunderSubtitleItem) -> None:
+        q_dir.mkdir(parents=True, exist_ok=True)
+        # Name every target before the fan-out: the downloads then only do network and
+        # write I/O, and same-named items cannot race for one free name.
+        paths: list[Path] = []
+        for it in selected_items:
+            safe_name = sanitize_component(it.name, max_len=120)
+            ext = sanitize_component(it.ext or "srt", max_len=10)
+            paths.append(ensure_unique_path(q_dir / f"{safe_name}.{ext}", reserved=paths))
+
+        async def _one(it: ThunderSubtitleItem, path: Path) -> Optional[str]:
             async with sem:
-                safe_name = sanitize_component(it.name, max_len=120)
-                ext = sanitize_component(it.ext or "srt", max_len=10)
-                q_dir.mkdir(parents=True, exist_ok=True)
-                path = ensure_unique_path(q_dir / f"{safe_name}.{ext}")
                 try:
-                    data = await download_with_retries(client, url=it.url, timeout_s=float(timeout), retries=int(retries))
-                    path.write_bytes(data)
+                    await download_to_with_retries(
+                        client, url=it.url, path=path, timeout_s=float(timeout), retries=int(retries)
+                    )
                 except Exception as e:
-                    errs.append(f"{q}: {it.name}: {e}")
-                finally:
-                    progress.advance(task_id, 1)
-
-        await asyncio.gather(*[_one(i) for i in selected_items])
+                    return f"{q}: {it.name}: {e}"
+                return None
+
+        # Tick the progress bar as each file lands rather than when the whole batch is done.
+        for fut in asyncio.as_completed([_one(it, p) for it, p in zip(selected_items, paths)]):
+            err = await fut
+            if err is not None:
+                errs.append(err)
+            progress.advance(task_id, 1)
         return errs
 
-    for q in queries:
-        items = asyncio.run(_search(q))
+    results = _run(_search_all())
+    for q, items in zip(queries, results):
+        if isinstance(items, BaseException):
+            console.print(f"搜索失败: {q}: {items}")
+            all_errs.append(f"{q}: 搜索失败: {items}")
+            total_fail += 1
+            continue
+        # The checkbox selector shows the results; a table first would list them twice.
         console.print(f"搜索: {q} (匹配 {len(items)}，显示 {len(items)})")
-        print_search_table(items)
         selected = selector.select(query=q, items=items)
         selected_items = [s.item for s in selected]
         if not selected_items:
@@ -273,7 +336,7 @@ def tui_batch_flow() -> None:
             console=console,
         ) as progress:
             task_id = progress.add_task(f"Downloading {len(selected_items)} file(s)...", total=len(selected_items))
-            errs = asyncio.run(_download_selected(q=q, q_dir=q_dir, selected_items=selected_items, progress=progress, task_id=task_id))
+            errs = _run(_download_selected(q=q, q_dir=q_dir, selected_items=selected_items, progress=progress, task_id=task_id))
 
         total_ok += len(selected_items) - len(errs)
         total_fail += len(errs)
@@ -1,43 +1,80 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import os
 import re
 from pathlib import Path
+from typing import Collection
 
-_CONTROL_CHARS_RE = re.compile(r"[\x00-\x1f\x7f]")
+_WHITESPACE_RE = re.compile(r"\s+")
+# One select-spec token: optional "n" or "a-b", then "," or end of input.
+_SELECT_TOKEN_RE = re.compile(r"\s*(?:(\d+)\s*(?:-\s*(\d+)\s*)?)?(,|$)")
+# One str.translate pass: drop control chars, map path separators and
+# Windows reserved characters to "_".
+_COMPONENT_TRANSLATION: dict[int, int | None] = {
+    **{c: None for c in range(0x20)},
+    0x7F: None,
+    **{ord(c): ord("_") for c in '\\/<>:"|?*'},
+}
 
 
+# Both are pure functions of their arguments and batch runs hit the same names
+# and ids repeatedly (search display, selection, download).
+@functools.lru_cache(maxsize=4096)
 def compute_item_id(*, gcid: str, cid: str) -> str:
-    return hashlib.md5(f"{gcid}{cid}".encode("utf-8")).hexdigest()
+    # The unit separator keeps ("ab", "c") and ("a", "bc") apart.
+    return hashlib.blake2b(f"{gcid}\x1f{cid}".encode("utf-8"), digest_size=16).hexdigest()
 
 
+@functools.lru_cache(maxsize=4096)
 def sanitize_component(s: str, *, max_len: int = 80) -> str:
     """
     Make a filesystem-safe single path component (no separators, no control chars).
     """
-    s = _CONTROL_CHARS_RE.sub("", s).strip()
-    s = s.replace("\\", "_").replace("/", "_")
-    s = re.sub(r"\s+", " ", s)
-    # Windows reserved characters
-    s = re.sub(r'[<>:"|?*]', "_", s)
+    s = s.translate(_COMPONENT_TRANSLATION).strip()
+    s = _WHITESPACE_RE.sub(" ", s)
     if not s:
         s = "untitled"
     s = s[:max_len].rstrip()
     return s
 
 
-def ensure_unique_path(path: Path) -> Path:
-    if not path.exists():
+def _name_taken(path: Path) -> bool:
+    # lstat: a name entry counts as taken even if it is a dangling symlink.
+    try:
+        os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    return True
+
+
+def ensure_unique_path(path: Path, *, reserved: Collection[Path] = ()) -> Path:
+    """
+    path if it neither exists nor is in reserved (paths already handed out to downloads
+    that have not been written yet), else "stem (k).ext" with k one past the highest
+    number already used in the directory.
+    """
+    if path not in reserved and not _name_taken(path):
         return path
     stem = path.stem
     suffix = path.suffix
     parent = path.parent
-    for i in range(1, 10_000):
+    # One directory listing instead of a stat per candidate number.
+    try:
+        with os.scandir(parent) as it:
+            names = [e.name for e in it]
+    except OSError:
+        names = []
+    names.extend(p.name for p in reserved if p.parent == parent)
+    pat = re.compile(re.escape(stem) + r" \((\d+)\)" + re.escape(suffix))
+    i = 1 + max((int(m.group(1)) for n in names if (m := pat.fullmatch(n))), default=0)
+    candidate = parent / f"{stem} ({i}){suffix}"
+    # Case-insensitive filesystems can still report a hit for a name the listing spelled differently.
+    while candidate in reserved or _name_taken(candidate):
+        i += 1
         candidate = parent / f"{stem} ({i}){suffix}"
-        if not candidate.exists():
-            return candidate
-    raise RuntimeError(f"Unable to find unique filename for: {path}")
+    return candidate
 
 
 def parse_select_spec(spec: str) -> list[int]:
@@ -47,26 +84,36 @@ def parse_select_spec(spec: str) -> list[int]:
     raw = (spec or "").strip()
     if not raw:
         return []
-    out: set[int] = set()
-    for part in raw.split(","):
-        part = part.strip()
-        if not part:
-            continue
-        if "-" in part:
-            a_str, b_str = part.split("-", 1)
-            a = int(a_str.strip())
-            b = int(b_str.strip())
-            if a <= b:
-                rng = range(a, b + 1)
-            else:
-                rng = range(b, a + 1)
-            out.update(rng)
-        else:
-            out.add(int(part))
-    return sorted(out)
+    spans: list[tuple[int, int]] = []
+    pos = 0
+    while True:
+        m = _SELECT_TOKEN_RE.match(raw, pos)
+        if m is None:
+            raise ValueError(f"Invalid selection: {spec!r}")
+        if m.group(1) is not None:
+            a = int(m.group(1))
+            b = a if m.group(2) is None else int(m.group(2))
+            spans.append((a, b) if a <= b else (b, a))
+        if not m.group(3):
+            break
+        pos = m.end()
+    # Merge overlapping/adjacent spans so a wide range like "1-10000" is expanded
+    # once, in order, without hashing every index through a set.
+    spans.sort()
+    out: list[int] = []
+    next_free: int | None = None
+    for lo, hi in spans:
+        if next_free is not None and lo < next_free:
+            lo = next_free
+        if lo <= hi:
+            out.extend(range(lo, hi + 1))
+            next_free = hi + 1
+    return out
 
 
+@functools.cache
 def is_tty() -> bool:
     # questionary needs both stdin and stdout as a tty for best behavior.
+    # fds 0/1 do not change kind during a run; tests can call is_tty.cache_clear().
     return os.isatty(0) and os.isatty(1)
 
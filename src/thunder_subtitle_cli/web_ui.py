@@ -8,14 +8,16 @@ if str(project_root / "src") not in sys.path:
 
 import asyncio
 import json
+import threading
+import weakref
 from datetime import datetime
 from typing import Optional
 
 import streamlit as st
-from streamlit.runtime.scriptrunner import RerunData, RerunException
+from streamlit.runtime.scriptrunner import RerunData, RerunException, get_script_run_ctx
 
-from thunder_subtitle_cli.client import ThunderClient, download_with_retries
-from thunder_subtitle_cli.core import apply_filters, format_item_label
+from thunder_subtitle_cli.client import download_to_with_retries
+from thunder_subtitle_cli.core import apply_filters, format_item_label, get_client
 from thunder_subtitle_cli.models import ThunderSubtitleItem
 from thunder_subtitle_cli.util import sanitize_component, ensure_unique_path
 
@@ -57,9 +59,14 @@ def init_session_state():
 def load_config():
     config_file = Path("ui_config.json")
     if config_file.exists():
+        # 每次交互都会重跑整个脚本；文件没变就不再重复读取和解析
+        mtime = config_file.stat().st_mtime_ns
+        if st.session_state.get("_config_mtime") == mtime:
+            return
         try:
             with open(config_file, "r", encoding="utf-8") as f:
                 st.session_state.config.update(json.load(f))
+            st.session_state._config_mtime = mtime
         except Exception as e:
             st.warning(f"配置加载失败: {e}")
 
@@ -73,175 +80,272 @@ def save_config():
         st.error(f"配置保存失败: {e}")
 
 
-def get_video_files(directory: str) -> list[Path]:
-    video_extensions = {"*.mp4", "*.mkv", "*.avi", "*.mov", "*.wmv", "*.flv", "*.webm", "*.m4v"}
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv", ".webm", ".m4v"})
+
+
+def _scandir_videos(path: str):
+    # 单次遍历：DirEntry 自带类型信息，不再为每个扩展名各遍历一遍
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for e in entries:
+        try:
+            # 不进入符号链接目录，避免循环；指向视频的符号链接文件照常保留
+            if e.is_dir(follow_symlinks=False):
+                yield from _scandir_videos(e.path)
+            # 先按文件名判断扩展名（不区分大小写），只有候选项才需要 is_file()
+            elif e.name[e.name.rfind("."):].lower() in VIDEO_EXTENSIONS and e.is_file():
+                yield e
+        except OSError:
+            continue
+
+
+def get_video_files(directory: str) -> list[tuple[Path, int]]:
+    # 返回 (路径, 字节数)：大小在遍历时顺带取得，显示列表时不必再逐个 stat
     video_dir = Path(directory)
     
     if not video_dir.exists() or not video_dir.is_dir():
         return []
     
-    video_files = []
-    for pattern in video_extensions:
-        # 递归搜索当前目录及其所有子目录
-        video_files.extend(video_dir.rglob(pattern))
-        # 搜索大写扩展名
-        video_files.extend(video_dir.rglob(pattern.upper()))
-    
-    return sorted(set(video_files))
+    # 递归搜索当前目录及其所有子目录
+    files = []
+    for e in _scandir_videos(str(video_dir)):
+        try:
+            files.append((Path(e.path), e.stat().st_size))
+        except OSError:
+            continue
+    return sorted(files)
+
+
+def run_async(coro):
+    # 每个会话固定一个事件循环：共享客户端的连接池按事件循环划分，
+    # 每次 asyncio.run() 都会新建循环，连接无法在多次搜索/下载之间复用。
+    # 协程内还会用到 st.* 和 session_state，所以仍在脚本线程里运行。
+    runner = st.session_state.get("_async_runner")
+    if runner is None:
+        runner = asyncio.Runner()
+        st.session_state._async_runner = runner
+        # 会话结束、session_state 被回收时关闭这个循环和它的连接池，否则每个会话泄漏一个
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            weakref.finalize(ctx.session_state, _close_runner, runner)
+    return runner.run(coro)
+
+
+def _close_runner(runner: asyncio.Runner) -> None:
+    def _close() -> None:
+        try:
+            runner.run(get_client().aclose())
+        finally:
+            runner.close()
+
+    # 垃圾回收可能发生在另一个会话正在跑事件循环的时候，那时不能在本线程里再跑一个循环
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        _close()
+    else:
+        threading.Thread(target=_close, name="close-async-runner").start()
+
+
+async def fetch_subtitles_async(query: str) -> list[ThunderSubtitleItem]:
+    # 只做网络请求和排序；过滤条件是本地的，调整后直接对缓存结果重新过滤即可
+    client = get_client()
+    items = await client.search(query=query, timeout_s=20.0)
+    return sorted(items, key=lambda x: x.score, reverse=True)
+
+
+def filter_subtitles(items: list[ThunderSubtitleItem]) -> list[ThunderSubtitleItem]:
+    items = apply_filters(
+        items,
+        min_score=st.session_state.config.get("min_score") or None,
+        lang=st.session_state.config.get("language") or None
+    )
+    return items[:50]
+
+
+async def search_subtitles_async(query: str) -> list[ThunderSubtitleItem]:
+    return filter_subtitles(await fetch_subtitles_async(query))
 
 
 def search_subtitles(query: str) -> list[ThunderSubtitleItem]:
-    async def _search():
-        client = ThunderClient()
-        items = await client.search(query=query, timeout_s=20.0)
-        items = sorted(items, key=lambda x: x.score, reverse=True)
-        items = apply_filters(
-            items,
-            min_score=st.session_state.config.get("min_score") or None,
-            lang=st.session_state.config.get("language") or None
-        )
-        return items[:50]
-    
-    return asyncio.run(_search())
+    return run_async(search_subtitles_async(query))
 
 
-def download_subtitle(item: ThunderSubtitleItem, save_dir: Path) -> Optional[Path]:
-    async def _download():
-        client = ThunderClient()
-        
-        # 下载字幕数据
-        data = await download_with_retries(
-            client,
-            url=item.url,
-            timeout_s=st.session_state.config.get("timeout", 60.0),
-            retries=st.session_state.config.get("retries", 2)
-        )
-        
-        # 生成简单文件名，避免编码问题
-        import re
-        import time
-        
-        # 使用时间戳和随机数生成唯一文件名
-        timestamp = int(time.time() * 1000)
-        ext = item.ext or "srt"
-        short_name = f"subtitle_{timestamp}.{ext}"
-        
-        # 尝试保存到多个位置
-        save_attempts = [
-            (save_dir, "设置目录"),
-            (Path.home() / "Downloads", "下载目录"),
-            (Path.home() / "Desktop", "桌面目录"),
-            (Path("D:\\subtitles"), "D盘根目录"),
-            (Path("C:\\subtitles"), "C盘根目录"),
-        ]
-        
-        # 保存失败的目录列表
-        failed_dirs = []
-        
-        for target_dir, dir_name in save_attempts:
-            try:
-                # 确保目录存在
-                target_dir.mkdir(parents=True, exist_ok=True)
-                
-                # 生成唯一路径
-                path = ensure_unique_path(target_dir / short_name)
-                
-                # 检查路径长度
-                if len(str(path)) > 250:
-                    raise Exception(f"路径过长: {path}")
-                
-                # 直接尝试写入文件
-                try:
-                    with open(path, 'wb') as f:
-                        f.write(data)
-                    
-                    # 保存成功
-                    st.success(f"✅ 保存到 {dir_name}: {path}")
-                    return path
-                except PermissionError as e:
-                    failed_dirs.append(f"{dir_name}: {e}")
-                    
-                    # 尝试使用临时文件然后移动
-                    import tempfile
-                    with tempfile.NamedTemporaryFile(suffix=f".{ext}", delete=False) as tmp:
-                        tmp.write(data)
-                        temp_path = Path(tmp.name)
-                    
-                    # 尝试移动文件
-                    try:
-                        import shutil
-                        shutil.move(str(temp_path), str(path))
-                        st.success(f"✅ 通过临时文件移动保存到 {dir_name}: {path}")
-                        return path
-                    except Exception as e:
-                        failed_dirs.append(f"{dir_name} (移动): {e}")
-                        temp_path.unlink(missing_ok=True)
-                        continue
-            except Exception as e:
-                failed_dirs.append(f"{dir_name}: {e}")
-                continue
-        
-        # 尝试临时文件
+def _claim_path(path: Path) -> Path:
+    # O_EXCL 创建空文件占位：通常一次系统调用即可，重名时才退回 ensure_unique_path 探测
+    while True:
         try:
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix=f".{ext}", delete=False) as tmp:
-                tmp.write(data)
-                temp_path = Path(tmp.name)
-                
-                # 保存到临时目录成功
-                st.info(f"✅ 保存到临时目录: {temp_path}")
-                
-                # 显示详细的权限诊断
-                st.warning("\n" + "="*80 + "\n")
-                st.warning("🔴  严重权限问题诊断")
-                st.warning("\n" + "="*80 + "\n")
-                st.warning("📋  失败的保存位置:")
-                for fail in failed_dirs:
-                    st.warning(f"- {fail}")
-                st.warning("\n" + "="*80 + "\n")
-                st.warning("�  可能的根本原因:")
-                st.warning("1. **用户权限不足**: 当前用户可能不是管理员")
-                st.warning("2. **防病毒软件阻止**: 防病毒软件可能设置为高防护模式")
-                st.warning("3. **安全软件限制**: 其他安全软件可能限制文件系统访问")
-                st.warning("4. **系统策略限制**: Windows组策略可能限制文件写入")
-                st.warning("5. **磁盘权限问题**: 磁盘可能被设置为只读")
-                st.warning("6. **网络驱动器问题**: 如果是网络驱动器，可能有额外限制")
-                st.warning("\n" + "="*80 + "\n")
-                st.warning("🛠️  紧急解决方案:")
-                st.warning("\n" + "="*80 + "\n")
-                st.warning("1. **使用管理员权限运行命令提示符**:")
-                st.warning("   - 步骤1: 按 Win+R 打开运行窗口")
-                st.warning("   - 步骤2: 输入 'cmd' 并按 Ctrl+Shift+Enter")
-                st.warning("   - 步骤3: 在管理员命令提示符中运行:")
-                st.warning("   - cd D:\\my workers\\thunder-subtitle-main")
-                st.warning("   - python -m streamlit run src\\thunder_subtitle_cli\\web_ui.py --server.port 8502")
-                st.warning("\n2. **检查防病毒软件设置**:")
-                st.warning("   - 临时禁用防病毒软件")
-                st.warning("   - 检查文件防护设置，添加本程序为信任")
-                st.warning("\n3. **检查磁盘权限**:")
-                st.warning("   - 右键点击磁盘 → 属性 → 安全")
-                st.warning("   - 确保当前用户有写入权限")
-                st.warning("\n4. **尝试不同的用户账户**:")
-                st.warning("   - 登录到管理员账户")
-                st.warning("   - 或创建一个新的用户账户")
-                st.warning("\n" + "="*80 + "\n")
-                st.warning("📌  临时解决方案:")
-                st.warning(f"- 文件已保存到临时目录: {temp_path}")
-                st.warning("- 请手动复制此文件到你需要的位置")
-                st.warning("- 或使用文件资源管理器将文件移动到目标目录")
-                st.warning("- 临时目录中的文件不会被自动删除")
-                st.warning("\n" + "="*80 + "\n")
-                st.warning("💡  技术提示:")
-                st.warning("- 这是系统级权限问题，不是程序代码问题")
-                st.warning("- 所有保存方法都已尝试，包括直接写入和临时文件移动")
-                st.warning("- 临时目录是唯一可行的解决方案")
-                st.warning("="*80)
-                
-                return temp_path
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            return path
+        except FileExistsError:
+            path = ensure_unique_path(path)
+
+
+async def download_subtitle_async(item: ThunderSubtitleItem, save_dir: Path) -> Optional[Path]:
+    client = get_client()
+    
+    # 生成简单文件名，避免编码问题
+    import tempfile
+    import time
+    
+    # 使用时间戳和随机数生成唯一文件名
+    timestamp = int(time.time() * 1000)
+    ext = item.ext or "srt"
+    short_name = f"subtitle_{timestamp}.{ext}"
+    
+    async def _download(path: Path) -> None:
+        try:
+            await download_to_with_retries(
+                client,
+                url=item.url,
+                path=path,
+                timeout_s=st.session_state.config.get("timeout", 60.0),
+                retries=st.session_state.config.get("retries", 2)
+            )
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+    
+    # 尝试保存到多个位置
+    save_attempts = [
+        (save_dir, "设置目录"),
+        (Path.home() / "Downloads", "下载目录"),
+        (Path.home() / "Desktop", "桌面目录"),
+        (Path("D:\\subtitles"), "D盘根目录"),
+        (Path("C:\\subtitles"), "C盘根目录"),
+    ]
+    # 上次对同一设置目录成功的位置排到最前，批量下载时不必每次从头试一遍失败的目录
+    resolved_dirs = st.session_state.setdefault("resolved_save_dirs", {})
+    preferred = resolved_dirs.get(str(save_dir))
+    if preferred is not None:
+        save_attempts.sort(key=lambda attempt: attempt[0] != preferred)
+    
+    # 保存失败的目录列表
+    failed_dirs = []
+    
+    for target_dir, dir_name in save_attempts:
+        try:
+            # 确保目录存在
+            target_dir.mkdir(parents=True, exist_ok=True)
+    
+            # 检查路径长度
+            if len(str(target_dir / short_name)) > 250:
+                raise Exception(f"路径过长: {target_dir / short_name}")
+    
+            # 生成唯一路径：占位文件创建成功即说明目录可写
+            path = _claim_path(target_dir / short_name)
         except Exception as e:
-            raise Exception(f"所有保存位置都失败: {e}")
+            failed_dirs.append(f"{dir_name}: {e}")
+            continue
     
-    return asyncio.run(_download())
+        # 直接边下边写到目标目录，不再先写系统临时目录再跨盘复制
+        try:
+            await _download(path)
+        except OSError as e:
+            # 写入失败（磁盘满、权限变化等）换下一个位置；网络错误照常抛出
+            failed_dirs.append(f"{dir_name}: {e}")
+            continue
+        resolved_dirs[str(save_dir)] = target_dir
+        st.success(f"✅ 保存到 {dir_name}: {path}")
+        return path
+    
+    # 所有位置都不可写时，才退回到系统临时目录
+    fd, tmp_name = tempfile.mkstemp(suffix=f".{ext}")
+    os.close(fd)
+    temp_path = Path(tmp_name)
+    await _download(temp_path)
+    
+    # 所有位置都失败时，文件仍留在临时目录
+    try:
+        # 保存到临时目录成功
+        st.info(f"✅ 保存到临时目录: {temp_path}")
+    
+        # 显示详细的权限诊断：一条提示 + 折叠的详情，不再逐行各发一条 st.warning
+        st.warning(f"🔴 所有保存位置都失败，文件已保存到临时目录: {temp_path}，请手动复制到需要的位置")
+        failed_lines = "\n".join(f"- {fail}" for fail in failed_dirs)
+        with st.expander("权限诊断详情", expanded=False):
+            st.markdown(f"""
+**📋 失败的保存位置:**
+
+{failed_lines}
+
+**🔍 可能的根本原因:**
+
+1. **用户权限不足**: 当前用户可能不是管理员
+2. **防病毒软件阻止**: 防病毒软件可能设置为高防护模式
+3. **安全软件限制**: 其他安全软件可能限制文件系统访问
+4. **系统策略限制**: Windows组策略可能限制文件写入
+5. **磁盘权限问题**: 磁盘可能被设置为只读
+6. **网络驱动器问题**: 如果是网络驱动器，可能有额外限制
+
+**🛠️ 紧急解决方案:**
+
+1. **使用管理员权限运行命令提示符**:
+   - 步骤1: 按 Win+R 打开运行窗口
+   - 步骤2: 输入 'cmd' 并按 Ctrl+Shift+Enter
+   - 步骤3: 在管理员命令提示符中运行:
+   - `cd D:\\my workers\\thunder-subtitle-main`
+   - `python -m streamlit run src\\thunder_subtitle_cli\\web_ui.py --server.port 8502`
+2. **检查防病毒软件设置**:
+   - 临时禁用防病毒软件
+   - 检查文件防护设置，添加本程序为信任
+3. **检查磁盘权限**:
+   - 右键点击磁盘 → 属性 → 安全
+   - 确保当前用户有写入权限
+4. **尝试不同的用户账户**:
+   - 登录到管理员账户
+   - 或创建一个新的用户账户
+
+**📌 临时解决方案:**
+
+- 文件已保存到临时目录: `{temp_path}`
+- 请手动复制此文件到你需要的位置
+- 或使用文件资源管理器将文件移动到目标目录
+- 临时目录中的文件不会被自动删除
+
+**💡 技术提示:**
+
+- 这是系统级权限问题，不是程序代码问题
+- 所有保存方法都已尝试，包括直接写入和临时文件移动
+- 临时目录是唯一可行的解决方案
+""")
+    
+        return temp_path
+    except Exception as e:
+        raise Exception(f"所有保存位置都失败: {e}")
+
+
+def download_subtitle(item: ThunderSubtitleItem, save_dir: Path) -> Optional[Path]:
+    return run_async(download_subtitle_async(item, save_dir))
+
+
+PREVIEW_PREFETCH_COUNT = 5
+# 预览只取开头一段（足够 5000 字符），不下载整个文件
+PREVIEW_MAX_BYTES = 32 * 1024
+
+
+async def _fetch_preview_bytes(item: ThunderSubtitleItem, timeout_s: float) -> tuple[bytes, bool]:
+    data = await get_client().download_prefix(url=item.url, max_bytes=PREVIEW_MAX_BYTES, timeout_s=timeout_s)
+    truncated = len(data) >= PREVIEW_MAX_BYTES
+    if truncated:
+        # 截断处可能切开多字节字符，退到最后一个换行
+        data = data[:data.rfind(b"\n") + 1] or data
+    return data, truncated
+
+
+def _format_preview(data: bytes, truncated: bool = False) -> str:
+    content = data.decode('utf-8', errors='replace')
+    total_length = len(content)
+    
+    # 增加预览字符数到5000，同时添加完整性指示
+    if truncated:
+        return content[:5000] + "\n\n...（预览已截断，仅下载了字幕开头部分）"
+    if len(content) > 5000:
+        return content[:5000] + f"\n\n...（预览已截断，完整字幕长度：{total_length} 字符）"
+    return content + f"\n\n...（预览完整，字幕长度：{total_length} 字符）"
 
 
 def preview_subtitle(item: ThunderSubtitleItem) -> Optional[str]:
@@ -252,17 +356,9 @@ def preview_subtitle(item: ThunderSubtitleItem) -> Optional[str]:
         return st.session_state.preview_state["preview_content"][preview_id]
     
     async def _preview():
-        client = ThunderClient()
         try:
-            data = await client.download_bytes(url=item.url, timeout_s=10.0)
-            content = data.decode('utf-8', errors='replace')
-            total_length = len(content)
-            
-            # 增加预览字符数到5000，同时添加完整性指示
-            if len(content) > 5000:
-                preview_content = content[:5000] + f"\n\n...（预览已截断，完整字幕长度：{total_length} 字符）"
-            else:
-                preview_content = content + f"\n\n...（预览完整，字幕长度：{total_length} 字符）"
+            data, truncated = await _fetch_preview_bytes(item, timeout_s=10.0)
+            preview_content = _format_preview(data, truncated)
             
             # 保存预览内容到会话状态
             st.session_state.preview_state["preview_content"][preview_id] = preview_content
@@ -272,7 +368,30 @@ def preview_subtitle(item: ThunderSubtitleItem) -> Optional[str]:
             st.session_state.preview_state["preview_content"][preview_id] = error_msg
             return error_msg
     
-    return asyncio.run(_preview())
+    return run_async(_preview())
+
+
+def prefetch_previews(items: list[ThunderSubtitleItem]) -> None:
+    # 搜索完成后并发取回前几条的预览，第一次点「预览」时直接读缓存
+    cache = st.session_state.preview_state["preview_content"]
+    todo = [it for it in items[:PREVIEW_PREFETCH_COUNT] if f"{it.gcid}:{it.cid}" not in cache]
+    if not todo:
+        return
+    sem = asyncio.Semaphore(max(1, int(st.session_state.config.get("concurrency", 3))))
+    
+    async def _fetch(item: ThunderSubtitleItem):
+        async with sem:
+            try:
+                data, truncated = await _fetch_preview_bytes(item, timeout_s=5.0)
+            except Exception:
+                # 预取失败不写缓存，点击预览时再正常请求并显示错误
+                return
+            cache[f"{item.gcid}:{item.cid}"] = _format_preview(data, truncated)
+    
+    async def _fetch_all():
+        await asyncio.gather(*(_fetch(it) for it in todo))
+    
+    run_async(_fetch_all())
 
 
 def render_sidebar():
@@ -357,7 +476,8 @@ def render_video_scanner():
     with col2:
         if st.button("🔄 扫描视频"):
             video_files = get_video_files(video_dir)
-            st.session_state.selected_videos = video_files
+            st.session_state.selected_videos = [path for path, _ in video_files]
+            st.session_state.video_sizes = dict(video_files)
             st.rerun()
     
     if st.session_state.selected_videos:
@@ -370,7 +490,10 @@ def render_video_scanner():
                 with col1:
                     st.write(f"**路径:** {str(video_path)}")
                 with col2:
-                    size = f"{video_path.stat().st_size / 1024 / 1024:.2f} MB"
+                    size_bytes = st.session_state.get("video_sizes", {}).get(video_path)
+                    if size_bytes is None:
+                        size_bytes = video_path.stat().st_size
+                    size = f"{size_bytes / 1024 / 1024:.2f} MB"
                     st.write(f"**大小:** {size}")
         
         st.success(f"✅ 扫描完成！找到 {len(st.session_state.selected_videos)} 个视频文件")
@@ -393,10 +516,13 @@ def render_subtitle_search():
     
     if search_button and query:
         with st.spinner("正在搜索字幕..."):
-            results = search_subtitles(query)
+            # 保存未过滤的结果：侧边栏调整分数/语言后只需本地重新过滤，不用再次搜索
+            raw_results = run_async(fetch_subtitles_async(query))
+            results = filter_subtitles(raw_results)
             
             if results:
-                st.session_state.search_results[query] = results
+                st.session_state.search_results[query] = raw_results
+                prefetch_previews(results)
                 st.success(f"找到 {len(results)} 个字幕")
             else:
                 st.warning("未找到匹配的字幕")
@@ -429,71 +555,69 @@ def render_subtitle_search():
         
         st.markdown("---")
         
-        for query, results in st.session_state.search_results.items():
+        for query, raw_results in st.session_state.search_results.items():
+            results = filter_subtitles(raw_results)
             st.markdown(f"**搜索词: `{query}`** ({len(results)} 个结果)")
+            if not results:
+                st.info("当前过滤条件下没有结果")
+                st.markdown("---")
+                continue
             
-            # 添加表头
-            header_col1, header_col2, header_col3, header_col4 = st.columns([4, 1, 1, 1])
-            with header_col1:
-                st.markdown("**文件名**")
-            with header_col2:
-                st.markdown("**类型**")
-            with header_col3:
-                st.markdown("**操作**")
-            with header_col4:
-                pass  # 占位
+            # 结果列表用一个单选控件展示，不再每行生成 4 个控件（最多 50 行 × 4 个）；
+            # 不用 st.dataframe：它依赖 pandas/numpy，此前在这里出过错
+            idx = st.radio(
+                "选择字幕",
+                options=range(len(results)),
+                format_func=lambda i, results=results: f"{results[i].name}  ({results[i].ext or 'srt'})",
+                key=f"pick_{query}",
+                label_visibility="collapsed",
+            )
+            item = results[idx]
+            preview_id = f"{item.gcid}:{item.cid}"
+            is_preview_active = st.session_state.preview_state["active_preview"] == preview_id
             
-            # 显示字幕列表，每行一个
-            for idx, item in enumerate(results):
-                col1, col2, col3, col4 = st.columns([4, 1, 1, 1])
-                preview_id = f"{item.gcid}:{item.cid}"
-                is_preview_active = st.session_state.preview_state["active_preview"] == preview_id
-                
-                with col1:
-                    st.write(item.name)
-                with col2:
-                    st.write(item.ext or "srt")
-                with col3:
-                    if is_preview_active:
-                        # 显示关闭预览按钮
-                        if st.button("关闭预览", key=f"close_preview_{preview_id}", use_container_width=True):
-                            st.session_state.preview_state["active_preview"] = None
-                            st.rerun()
-                    else:
-                        # 显示预览按钮
-                        if st.button("预览", key=f"preview_{preview_id}", use_container_width=True):
-                            st.session_state.preview_state["active_preview"] = preview_id
-                            st.rerun()
-                with col4:
-                    if st.button("下载", key=f"download_{preview_id}", use_container_width=True):
-                        # 使用用户选择的临时保存目录
-                        save_dir = Path(temp_save_dir)
-                        
-                        with st.spinner("正在下载..."):
-                            try:
-                                saved_path = download_subtitle(item, save_dir)
-                                if saved_path:
-                                    st.success(f"下载成功: {saved_path}")
-                                    st.session_state.download_history.append({
-                                        "name": item.name,
-                                        "path": str(saved_path),
-                                        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                    })
-                                else:
-                                    st.error("下载失败")
-                            except Exception as e:
-                                st.error(f"下载失败: {e}")
-                
-                # 显示预览内容
+            col1, col2, _ = st.columns([1, 1, 4])
+            with col1:
                 if is_preview_active:
-                    with st.expander("字幕预览", expanded=True):
-                        with st.spinner("正在加载预览..."):
-                            preview_content = preview_subtitle(item)
-                            if preview_content:
-                                # 使用大尺寸的代码块显示预览
-                                st.code(preview_content, language="text", line_numbers=True)
+                    # 显示关闭预览按钮
+                    if st.button("关闭预览", key=f"close_preview_{query}", use_container_width=True):
+                        st.session_state.preview_state["active_preview"] = None
+                        st.rerun()
+                else:
+                    # 显示预览按钮
+                    if st.button("预览", key=f"preview_{query}", use_container_width=True):
+                        st.session_state.preview_state["active_preview"] = preview_id
+                        st.rerun()
+            with col2:
+                if st.button("下载", key=f"download_{query}", use_container_width=True):
+                    # 使用用户选择的临时保存目录
+                    save_dir = Path(temp_save_dir)
+                    
+                    with st.spinner("正在下载..."):
+                        try:
+                            saved_path = download_subtitle(item, save_dir)
+                            if saved_path:
+                                st.success(f"下载成功: {saved_path}")
+                                st.session_state.download_history.append({
+                                    "name": item.name,
+                                    "path": str(saved_path),
+                                    "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                                })
                             else:
-                                st.warning("无法预览此字幕")
+                                st.error("下载失败")
+                        except Exception as e:
+                            st.error(f"下载失败: {e}")
+            
+            # 显示预览内容
+            if is_preview_active:
+                with st.expander("字幕预览", expanded=True):
+                    with st.spinner("正在加载预览..."):
+                        preview_content = preview_subtitle(item)
+                        if preview_content:
+                            # 使用大尺寸的代码块显示预览
+                            st.code(preview_content, language="text", line_numbers=True)
+                        else:
+                            st.warning("无法预览此字幕")
             
             # 添加分隔线
             st.markdown("---")
@@ -553,41 +677,54 @@ def render_batch_download():
             save_path = Path(temp_save_dir)
             save_path.mkdir(parents=True, exist_ok=True)
             
-            total = len(st.session_state.selected_videos)
+            videos = list(st.session_state.selected_videos)
+            total = len(videos)
             success_count = 0
             fail_count = 0
+            concurrency = max(1, int(st.session_state.config.get("concurrency", 3)))
             
-            for idx, video_path in enumerate(st.session_state.selected_videos):
-                video_name = video_path.stem
-                status_text.text(f"正在搜索: {video_name} ({idx + 1}/{total})")
-                
-                try:
-                    results = search_subtitles(video_name)
-                    
-                    if results:
+            async def _process(video_path: Path, sem: asyncio.Semaphore):
+                # 搜索+下载整体受并发数限制；返回值带上视频路径，失败时也能对应上
+                async with sem:
+                    try:
+                        results = await search_subtitles_async(video_path.stem)
+                        if not results:
+                            return video_path, None, None, None
                         best_subtitle = results[0]
-                        saved_path = download_subtitle(best_subtitle, save_path)
-                        
-                        if saved_path:
-                            success_count += 1
-                            st.success(f"✅ {video_name} -> {saved_path.name}")
-                            st.session_state.download_history.append({
-                                "name": best_subtitle.name,
-                                "path": str(saved_path),
-                                "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            })
-                        else:
-                            fail_count += 1
-                            st.warning(f"⚠️ {video_name} 下载失败")
-                    else:
+                        saved_path = await download_subtitle_async(best_subtitle, save_path)
+                        return video_path, best_subtitle, saved_path, None
+                    except Exception as e:
+                        return video_path, None, None, e
+            
+            async def _run_batch():
+                nonlocal success_count, fail_count
+                sem = asyncio.Semaphore(concurrency)
+                status_text.text(f"正在搜索 {total} 个视频（并发 {concurrency}）...")
+                # 每完成一个就刷新进度，而不是等全部结束
+                for done, fut in enumerate(asyncio.as_completed([_process(v, sem) for v in videos]), 1):
+                    video_path, best_subtitle, saved_path, err = await fut
+                    video_name = video_path.stem
+                    if err is not None:
+                        fail_count += 1
+                        st.error(f"❌ {video_name} 错误: {err}")
+                    elif best_subtitle is None:
                         fail_count += 1
                         st.warning(f"⚠️ {video_name} 未找到字幕")
-                
-                except Exception as e:
-                    fail_count += 1
-                    st.error(f"❌ {video_name} 错误: {e}")
-                
-                progress_bar.progress((idx + 1) / total)
+                    elif saved_path:
+                        success_count += 1
+                        st.success(f"✅ {video_name} -> {saved_path.name}")
+                        st.session_state.download_history.append({
+                            "name": best_subtitle.name,
+                            "path": str(saved_path),
+                            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        })
+                    else:
+                        fail_count += 1
+                        st.warning(f"⚠️ {video_name} 下载失败")
+                    status_text.text(f"已完成 {done}/{total}")
+                    progress_bar.progress(done / total)
+            
+            run_async(_run_batch())
             
             status_text.text(f"完成！成功: {success_count}, 失败: {fail_count}")
             st.balloons()
@@ -612,9 +749,9 @@ def render_download_history():
             with col2:
                 st.write(f"**下载时间:** {record['time']}")
                 # 显示文件名和目录分离
-                path_obj = Path(record['path'])
-                st.write(f"**文件名:** {path_obj.name}")
-                st.write(f"**目录:** {path_obj.parent}")
+                record_path = record['path']
+                st.write(f"**文件名:** {os.path.basename(record_path)}")
+                st.write(f"**目录:** {os.path.dirname(record_path) or '.'}")
     
     col1, col2 = st.columns([1, 1])
     
@@ -4,11 +4,19 @@ FastAPI Web UI for Thunder Subtitle
 """
 
 import asyncio
+import codecs
+import contextlib
+import importlib.util
+import io
 import json
 import os
+import platform
+import re
+import tempfile
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Deque, Dict, Any
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
@@ -18,18 +26,64 @@ from fastapi.requests import Request
 from pydantic import BaseModel
 import uvicorn
 
-from thunder_subtitle_cli.client import ThunderClient
+from thunder_subtitle_cli.client import ThunderAPIError, ThunderClient, download_to_with_retries
+from thunder_subtitle_cli.core import get_client
 from thunder_subtitle_cli.models import ThunderSubtitleItem
 from thunder_subtitle_cli.util import sanitize_component
-from thunder_subtitle_cli.ai_evaluator import AIEvaluator, RuleBasedEvaluator, get_evaluator, extract_text, calculate_filename_similarity
+from thunder_subtitle_cli.ai_evaluator import AIEvaluator, RuleBasedEvaluator, get_evaluator, extract_text, calculate_filename_similarities
 from thunder_subtitle_cli.directory_watcher import watcher, WatchDirectory, HAS_WATCHDOG
 
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _read_json(path: Path) -> Any:
+    data = path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    # Write a sibling temp file and swap it in, so a crash never leaves torn JSON behind.
+    # Each write gets its own temp name: concurrent writers must not share one file.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates the file owner-only; keep the usual mode for the replaced file
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+async def _request_json(request: Request) -> Any:
+    """request.json(), decoded with orjson when it is installed"""
+    if orjson is None:
+        return await request.json()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers see the same error type
+    return orjson.loads(await request.body())
+
+
 class SafeJSONResponse(Response):
     """Safe JSON Response with correct Content-Length"""
     media_type = "application/json"
     
     def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # orjson rejects a few things the stdlib accepts (e.g. ints > 64 bits).
+                pass
         return json.dumps(
             content,
             ensure_ascii=False,
@@ -39,32 +93,110 @@ class SafeJSONResponse(Response):
         ).encode("utf-8")
 
 
-def detect_and_convert_to_utf8(data: bytes) -> bytes:
+_CJK_RE = re.compile('[\u4e00-\u9fff]')
+
+
+def _detect_legacy_encoding(data: bytes, final: bool = True) -> Optional[str]:
     """
-    Detect subtitle encoding and convert to UTF-8
-    Returns UTF-8 encoded bytes
+    Encoding to convert non-UTF-8 subtitle bytes from, or None to leave them as-is.
+    final=False allows data to end mid-character (a head read from a larger file).
     """
-    encodings_to_try = ['utf-8', 'gbk', 'gb2312', 'gb18030', 'big5', 'shift_jis', 'euc-jp', 'iso-8859-1']
+    encodings_to_try = ['gbk', 'gb2312', 'gb18030', 'big5', 'shift_jis', 'euc-jp', 'iso-8859-1']
     
     for encoding in encodings_to_try:
         try:
-            text = data.decode(encoding)
-            chinese_chars = [c for c in text if '\u4e00' <= c <= '\u9fff']
-            
-            if encoding == 'utf-8' or len(chinese_chars) > 0:
-                if encoding != 'utf-8':
-                    print(f"[Encoding] Converted from {encoding} to UTF-8 ({len(chinese_chars)} Chinese chars)")
-                    return text.encode('utf-8')
-                else:
-                    return data
-        except Exception:
+            text = codecs.getincrementaldecoder(encoding)().decode(data, final)
+        except UnicodeDecodeError:
             continue
+        # Only convert when the decode actually yields Chinese text
+        if _CJK_RE.search(text):
+            return encoding
+    
+    return None
+
+
+def detect_and_convert_to_utf8(data: bytes) -> bytes:
+    """
+    Detect subtitle encoding and convert to UTF-8
+    Returns UTF-8 encoded bytes
+    """
+    # ASCII is valid UTF-8; isascii() scans the whole buffer without building a str.
+    # (A prefix check is not enough: GBK subtitles usually start with ASCII timing lines.)
+    if data.isascii():
+        return data
+    try:
+        data.decode('utf-8')
+        return data
+    except UnicodeDecodeError:
+        pass
+    
+    encoding = _detect_legacy_encoding(data)
+    if encoding is None:
+        return data
+    print(f"[Encoding] Converted from {encoding} to UTF-8")
+    return data.decode(encoding, errors='replace').encode('utf-8')
+
+
+# Bytes of a downloaded file used to guess its encoding
+ENCODING_PROBE_BYTES = 64 * 1024
+_FILE_CHUNK_SIZE = 64 * 1024
+
+
+def _is_utf8_file(path: Path) -> bool:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with path.open('rb') as f:
+            for chunk in iter(lambda: f.read(_FILE_CHUNK_SIZE), b''):
+                decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def convert_file_to_utf8(path: Path) -> None:
+    """
+    File counterpart of detect_and_convert_to_utf8: guesses the encoding from the
+    head of the file and re-encodes it chunk by chunk, so the body is never held in memory
+    """
+    if _is_utf8_file(path):
+        return
+    with path.open('rb') as f:
+        head = f.read(ENCODING_PROBE_BYTES)
+    encoding = _detect_legacy_encoding(head, final=len(head) < ENCODING_PROBE_BYTES)
+    if encoding is None:
+        return
     
-    return data
+    tmp = path.with_name(path.name + '.utf8')
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        with path.open('rb') as src, tmp.open('wb') as dst:
+            for chunk in iter(lambda: src.read(_FILE_CHUNK_SIZE), b''):
+                dst.write(decoder.decode(chunk).encode('utf-8'))
+            dst.write(decoder.decode(b'', final=True).encode('utf-8'))
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    print(f"[Encoding] Converted {path.name} from {encoding} to UTF-8")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    await autostart_watcher_from_config()
+    yield
+    await flush_download_history()
+    # Close the pooled connections shared by all request handlers
+    await get_client().aclose()
 
 
 # Create FastAPI app
-app = FastAPI(title="Thunder Subtitle Web UI", version="1.0.0")
+app = FastAPI(
+    title="Thunder Subtitle Web UI",
+    version="1.0.0",
+    default_response_class=SafeJSONResponse,
+    lifespan=lifespan,
+)
 
 # Configure directories for both development and PyInstaller packaged environments
 import sys
@@ -101,14 +233,27 @@ config = {
     "retries": 2
 }
 
+# st_mtime_ns of ui_config.json as last read or written by this process
+_config_mtime_ns: Optional[int] = None
+
+def _config_file_mtime_ns() -> Optional[int]:
+    try:
+        return CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
 # Load config
 def load_config():
-    global config
-    if CONFIG_FILE.exists():
+    """Load ui_config.json; a no-op when the file is unchanged since the last load/save"""
+    global config, _config_mtime_ns
+    mtime_ns = _config_file_mtime_ns()
+    if mtime_ns is not None:
+        if mtime_ns == _config_mtime_ns:
+            return
         try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                loaded_config = json.load(f)
-                config.update(loaded_config)
+            loaded_config = _read_json(CONFIG_FILE)
+            config.update(loaded_config)
+            _config_mtime_ns = mtime_ns
         except Exception as e:
             print(f"Failed to load config: {e}")
     else:
@@ -116,9 +261,8 @@ def load_config():
         example_config_file = BASE_DIR / "ui_config.example.json"
         if example_config_file.exists():
             try:
-                with open(example_config_file, 'r', encoding='utf-8') as f:
-                    example_config = json.load(f)
-                    config.update(example_config)
+                example_config = _read_json(example_config_file)
+                config.update(example_config)
                 # Save to ui_config.json
                 save_config()
                 print("Initialized config from ui_config.example.json")
@@ -127,9 +271,11 @@ def load_config():
 
 # Save config
 def save_config():
+    global _config_mtime_ns
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        _write_json(CONFIG_FILE, config)
+        # Our own write must not look like an external edit to the next load_config()
+        _config_mtime_ns = _config_file_mtime_ns()
     except Exception as e:
         print(f"Failed to save config: {e}")
 
@@ -137,103 +283,112 @@ def save_config():
 load_config()
 
 HISTORY_FILE = BASE_DIR / "download_history.json"
-_download_history: List[Dict[str, Any]] = []
+# Newest first; the deque drops the oldest entry once it is full
+HISTORY_MAX_ITEMS = 100
+_download_history: Deque[Dict[str, Any]] = deque(maxlen=HISTORY_MAX_ITEMS)
 
 def load_download_history():
     """Load download history from file"""
     global _download_history
     if HISTORY_FILE.exists():
         try:
-            with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
-                _download_history = json.load(f)
+            _download_history = deque(_read_json(HISTORY_FILE), maxlen=HISTORY_MAX_ITEMS)
         except Exception as e:
             print(f"Failed to load download history: {e}")
-            _download_history = []
+            _download_history = deque(maxlen=HISTORY_MAX_ITEMS)
 
-def save_download_history():
+# Additions within this window are written to disk together
+HISTORY_FLUSH_DELAY_S = 2.0
+_history_flush_task: Optional[asyncio.Task] = None
+# One write at a time: two worker threads replacing the file could leave the older snapshot
+_history_write_lock = asyncio.Lock()
+# Bumped on every addition, so a delayed save can tell whether it missed any
+_history_revision = 0
+
+def save_download_history(history: Optional[List[Dict[str, Any]]] = None):
     """Save download history to file"""
     try:
-        with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(_download_history, f, ensure_ascii=False, indent=2)
+        _write_json(HISTORY_FILE, list(_download_history) if history is None else history)
     except Exception as e:
         print(f"Failed to save download history: {e}")
 
+async def _write_download_history() -> int:
+    async with _history_write_lock:
+        # Snapshot on the loop thread; the list may change while the worker thread writes
+        revision = _history_revision
+        await asyncio.to_thread(save_download_history, list(_download_history))
+        return revision
+
+async def _flush_download_history_later():
+    global _history_flush_task
+    written = None
+    try:
+        await asyncio.sleep(HISTORY_FLUSH_DELAY_S)
+        # Shielded: cancelling the save must not release the lock while the thread still writes
+        written = await asyncio.shield(_write_download_history())
+    finally:
+        if _history_flush_task is asyncio.current_task():
+            _history_flush_task = None
+            if written is not None and written != _history_revision:
+                _history_flush_task = asyncio.get_running_loop().create_task(_flush_download_history_later())
+
+async def flush_download_history():
+    """Save download history now, replacing any pending delayed save"""
+    global _history_flush_task
+    task, _history_flush_task = _history_flush_task, None
+    if task is not None:
+        task.cancel()
+    await asyncio.shield(_write_download_history())
+
 def add_download_history(item: Dict[str, Any]):
     """Add item to download history"""
-    global _download_history
-    _download_history.insert(0, item)
-    if len(_download_history) > 100:
-        _download_history = _download_history[:100]
-    save_download_history()
+    global _history_flush_task, _history_revision
+    _download_history.appendleft(item)
+    _history_revision += 1
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        save_download_history()
+        return
+    if _history_flush_task is None:
+        _history_flush_task = loop.create_task(_flush_download_history_later())
+
+# Compiled once; clean_subtitle_filename runs for every video in batch and watcher downloads.
+_FILENAME_PREFIX_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'^hhd800\.com@',
+    r'^hhd800@',
+    r'^www\.[^@]+@',
+    r'^[a-zA-Z0-9\-\.]+\.(com|net|org|cc|tv)@',
+    r'^\[[^\]]+\]',
+    r'^【[^】]+】',
+))
+
+# Tried in order: a separated code ("ABC-123") anywhere beats an unseparated one ("ABC123").
+# Studio-specific forms like SSIS[-_]?\d{3,4} are not listed: everything they match is
+# already matched by one of these two, so they could never be the first hit.
+_FILENAME_CODE_RES = (
+    re.compile(r'([A-Z]{2,6}[-_]\d{2,4})', re.IGNORECASE),
+    re.compile(r'([A-Z]{2,6}\d{2,4})', re.IGNORECASE),
+)
+
+_BRACKETS_TRANS = str.maketrans('', '', '[]【】')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 def clean_subtitle_filename(name: str) -> str:
     """Clean subtitle filename, remove unwanted prefixes and suffixes"""
-    import re
-    
     clean_name = name
     
-    prefixes_to_remove = [
-        r'^hhd800\.com@',
-        r'^hhd800@',
-        r'^www\.[^@]+@',
-        r'^[a-zA-Z0-9\-\.]+\.(com|net|org|cc|tv)@',
-        r'^\[[^\]]+\]',
-        r'^【[^】]+】',
-    ]
-    
-    for pattern in prefixes_to_remove:
-        clean_name = re.sub(pattern, '', clean_name, flags=re.IGNORECASE)
-    
-    code_patterns = [
-        r'([A-Z]{2,6}[-_]\d{2,4})',
-        r'([A-Z]{2,6}\d{2,4})',
-        r'(SSIS[-_]?\d{3,4})',
-        r'(SSNI[-_]?\d{3,4})',
-        r'(SONE[-_]?\d{3,4})',
-        r'(IPX[-_]?\d{3,4})',
-        r'(IPZZ[-_]?\d{3,4})',
-        r'(PRED[-_]?\d{3,4})',
-        r'(STARS[-_]?\d{3,4})',
-        r'(MIAA[-_]?\d{3,4})',
-        r'(MIDE[-_]?\d{3,4})',
-        r'(JUFD[-_]?\d{3,4})',
-        r'(JUL[-_]?\d{3,4})',
-        r'(JUQ[-_]?\d{3,4})',
-        r'(JUY[-_]?\d{3,4})',
-        r'(JUX[-_]?\d{3,4})',
-        r'(PRED[-_]?\d{3,4})',
-        r'(CAWD[-_]?\d{3,4})',
-        r'(FSDSS[-_]?\d{3,4})',
-        r'(FSD[-_]?\d{3,4})',
-        r'(HND[-_]?\d{3,4})',
-        r'(HND[-_]?\d{3,4})',
-        r'(PPPD[-_]?\d{3,4})',
-        r'(ABW[-_]?\d{3,4})',
-        r'(ABP[-_]?\d{3,4})',
-        r'(SDDE[-_]?\d{3,4})',
-        r'(SDJS[-_]?\d{3,4})',
-        r'(SDMU[-_]?\d{3,4})',
-        r'(KIRE[-_]?\d{3,4})',
-        r'(KTKL[-_]?\d{3,4})',
-        r'(KTKC[-_]?\d{3,4})',
-        r'(VEMA[-_]?\d{3,4})',
-        r'(VENU[-_]?\d{3,4})',
-        r'(VENZ[-_]?\d{3,4})',
-        r'(GVG[-_]?\d{3,4})',
-        r'(GIGL[-_]?\d{3,4})',
-        r'(HBAD[-_]?\d{3,4})',
-        r'(HND[-_]?\d{3,4})',
-    ]
+    for pattern in _FILENAME_PREFIX_RES:
+        clean_name = pattern.sub('', clean_name)
     
-    for pattern in code_patterns:
-        match = re.search(pattern, clean_name, re.IGNORECASE)
+    for pattern in _FILENAME_CODE_RES:
+        match = pattern.search(clean_name)
         if match:
-            code = match.group(1).upper()
-            code = re.sub(r'_', '-', code)
-            return code
+            return match.group(1).upper().replace('_', '-')
     
-    clean_name = re.sub(r'[\[\]【】]', '', clean_name)
-    clean_name = re.sub(r'\s+', ' ', clean_name).strip()
+    clean_name = clean_name.translate(_BRACKETS_TRANS)
+    clean_name = _WHITESPACE_RE.sub(' ', clean_name).strip()
     
     if '.' in clean_name:
         clean_name = clean_name.rsplit('.', 1)[0]
@@ -255,15 +410,20 @@ def init_watcher_from_config():
                 enabled=wd.get("enabled", True),
                 file_types=wd.get("file_types", watcher_config.get("default_file_types", [])),
                 output_dir=wd.get("output_dir", watcher_config.get("default_output_dir", "")),
-                use_ai=wd.get("use_ai", watcher_config.get("use_ai_by_default", False))
+                use_ai=wd.get("use_ai", watcher_config.get("use_ai_by_default", False)),
+                debounce_s=float(wd.get("debounce_s", 0.5))
             )
             watcher.add_watch_directory(watch_dir)
             print(f"[Watcher] Loaded directory: {path}")
     
-    watcher.set_process_callback(process_new_video_file)
-    
+    watcher.set_process_callback(process_new_video_files)
+
+
+async def autostart_watcher_from_config():
+    """Start the watcher on the server loop if it was running when config was saved"""
+    watcher_config = config.get("directory_watcher", {})
     if watcher_config.get("enabled", False) and watcher.get_watch_directories():
-        watcher.start()
+        await watcher.start_async()
         print(f"[Watcher] Auto-started monitoring")
 
 # Data models
@@ -410,6 +570,8 @@ async def vite_client():
 @app.get("/api/config")
 async def get_config():
     """Get config"""
+    # Pick up hand edits to ui_config.json; cheap stat when nothing changed
+    load_config()
     return SafeJSONResponse(content=config)
 
 @app.post("/api/config")
@@ -418,7 +580,7 @@ async def update_config(config_data: ConfigModel):
     global config
     data = config_data.dict(exclude_none=True)
     config.update(data)
-    save_config()
+    await asyncio.to_thread(save_config)
     return SafeJSONResponse(content={"success": True, "config": config})
 
 
@@ -427,7 +589,7 @@ async def import_config(request: Request):
     """Import full config"""
     global config
     try:
-        data = await request.json()
+        data = await _request_json(request)
         
         allowed_keys = [
             "video_dir", "save_dir", "min_score", "language", 
@@ -441,10 +603,11 @@ async def import_config(request: Request):
                 imported_config[key] = data[key]
         
         config.update(imported_config)
-        save_config()
+        await asyncio.to_thread(save_config)
         
         if "directory_watcher" in imported_config:
             init_watcher_from_config()
+            await autostart_watcher_from_config()
         
         return SafeJSONResponse(content={
             "success": True, 
@@ -503,7 +666,7 @@ async def reset_config():
     }
     
     config = default_config
-    save_config()
+    await asyncio.to_thread(save_config)
     
     if watcher:
         watcher.stop()
@@ -537,7 +700,7 @@ async def update_ai_config(ai_config_data: AIConfigModel):
     """Update AI evaluator config"""
     global config
     config["ai_evaluator"] = ai_config_data.dict()
-    save_config()
+    await asyncio.to_thread(save_config)
     return SafeJSONResponse(content={
         "success": True,
         "ai_config": config["ai_evaluator"]
@@ -548,7 +711,7 @@ async def update_ai_config(ai_config_data: AIConfigModel):
 async def evaluate_subtitle(request: Request):
     """Evaluate subtitle quality using AI"""
     try:
-        data = await request.json()
+        data = await _request_json(request)
         url = data.get("url", "")
         ext = data.get("ext", "srt")
         
@@ -558,7 +721,7 @@ async def evaluate_subtitle(request: Request):
                 "error": "No URL provided"
             })
         
-        client = ThunderClient()
+        client = get_client()
         content_bytes = await client.download_bytes(url=url, timeout_s=config.get("timeout", 60.0))
         
         try:
@@ -567,7 +730,7 @@ async def evaluate_subtitle(request: Request):
             content = content_bytes.decode('gbk', errors='ignore')
         
         evaluator = get_evaluator(config)
-        result = evaluator.evaluate(content, ext)
+        result = await evaluator.evaluate_async(content, ext)
         
         return SafeJSONResponse(content={
             "success": True,
@@ -602,28 +765,25 @@ async def search_subtitles(request: SearchRequest):
     """Search subtitles"""
     try:
         print(f"Search request: keyword={request.keyword}, min_score={request.min_score}, language={request.language}")
-        client = ThunderClient()
+        client = get_client()
         
         results = await client.search(query=request.keyword)
         
         print(f"Search results: {len(results)}")
         
-        results = results[:50]
-        
-        subtitles = []
-        for item in results:
-            language_str = ", ".join(item.languages) if item.languages else "Unknown"
-            
-            subtitles.append({
+        subtitles = [
+            {
                 "gcid": item.gcid,
                 "cid": item.cid,
                 "name": item.name,
                 "ext": item.ext,
                 "url": item.url,
                 "score": item.score,
-                "language": language_str,
+                "language": ", ".join(item.languages) if item.languages else "Unknown",
                 "size": item.duration
-            })
+            }
+            for item in results[:50]
+        ]
         
         print(f"Returning subtitles: {len(subtitles)}")
         
@@ -643,24 +803,32 @@ async def search_subtitles(request: SearchRequest):
             "error": str(e)
         }, status_code=500)
 
+# Enough bytes for the 50 preview lines even with long ASS style lines.
+PREVIEW_MAX_BYTES = 32 * 1024
+
 @app.post("/api/preview")
 async def preview_subtitle(request: SearchRequest):
     """Preview subtitle"""
     try:
-        client = ThunderClient()
+        client = get_client()
+        
+        # Only the head of the file is shown, so only the head is fetched.
+        subtitle_data = await client.download_prefix(url=request.keyword, max_bytes=PREVIEW_MAX_BYTES)
+        if len(subtitle_data) >= PREVIEW_MAX_BYTES:
+            # Cut at the last newline so a split multi-byte character cannot break decoding.
+            subtitle_data = subtitle_data[:subtitle_data.rfind(b'\n') + 1] or subtitle_data
         
-        subtitle_data = await client.download_bytes(url=request.keyword)
+        # Keep the 50 preview lines before decoding; b'\n' never occurs inside a
+        # UTF-8 or GBK multi-byte character, so splitting the raw bytes is safe.
+        head = b'\n'.join(subtitle_data.split(b'\n', 50)[:50])
         
         try:
-            preview_text = subtitle_data.decode('utf-8')
-        except:
+            preview = head.decode('utf-8')
+        except UnicodeDecodeError:
             try:
-                preview_text = subtitle_data.decode('gbk')
-            except:
-                preview_text = subtitle_data.decode('latin-1')
-        
-        lines = preview_text.split('\n')[:50]
-        preview = '\n'.join(lines)
+                preview = head.decode('gbk')
+            except UnicodeDecodeError:
+                preview = head.decode('latin-1')
         
         return SafeJSONResponse(content={
             "success": True,
@@ -677,7 +845,7 @@ async def preview_subtitle(request: SearchRequest):
 async def download_subtitle(request: Request):
     """Download subtitle"""
     try:
-        data = await request.json()
+        data = await _request_json(request)
         url = data.get("url")
         name = data.get("name", "")
         ext = data.get("ext", "srt")
@@ -686,16 +854,7 @@ async def download_subtitle(request: Request):
         if not url:
             raise HTTPException(status_code=400, detail="URL cannot be empty")
         
-        client = ThunderClient()
-        
-        subtitle_data = await download_with_retries(
-            client,
-            url=url,
-            timeout_s=config.get("timeout", 60.0),
-            retries=config.get("retries", 2)
-        )
-        
-        subtitle_data = detect_and_convert_to_utf8(subtitle_data)
+        client = get_client()
         
         if video_name:
             if "." in video_name:
@@ -728,8 +887,16 @@ async def download_subtitle(request: Request):
                 file_path = os.path.join(save_dir, filename)
                 print(f"Save file path: {file_path}")
                 
-                with open(file_path, 'wb') as f:
-                    f.write(subtitle_data)
+                # Stream straight to disk, then re-encode off the event loop; the
+                # subtitle is never held in memory as a whole.
+                await download_to_with_retries(
+                    client,
+                    url=url,
+                    path=Path(file_path),
+                    timeout_s=config.get("timeout", 60.0),
+                    retries=config.get("retries", 2)
+                )
+                await asyncio.to_thread(convert_file_to_utf8, Path(file_path))
                 print(f"File saved successfully: {file_path}")
                 
                 return SafeJSONResponse(content={
@@ -737,6 +904,9 @@ async def download_subtitle(request: Request):
                     "message": f"Subtitle saved to: {file_path}",
                     "file_path": file_path
                 })
+            except ThunderAPIError:
+                # The download itself failed, not the save
+                raise
             except Exception as e:
                 print(f"Failed to save file: {e}")
                 import traceback
@@ -747,6 +917,13 @@ async def download_subtitle(request: Request):
                     "fallback": True
                 })
         else:
+            subtitle_data = await download_with_retries(
+                client,
+                url=url,
+                timeout_s=config.get("timeout", 60.0),
+                retries=config.get("retries", 2)
+            )
+            subtitle_data = detect_and_convert_to_utf8(subtitle_data)
             return Response(
                 content=subtitle_data,
                 media_type="application/octet-stream",
@@ -767,7 +944,7 @@ async def download_subtitle(request: Request):
 async def batch_download_subtitles(request: Request):
     """Batch download subtitles"""
     try:
-        data = await request.json()
+        data = await _request_json(request)
         videos = data.get("videos", [])
         use_ai = data.get("use_ai", False)
         
@@ -779,15 +956,11 @@ async def batch_download_subtitles(request: Request):
         
         print(f"Batch download request: {len(videos)} videos, AI: {use_ai}")
         
-        client = ThunderClient()
+        client = get_client()
         evaluator = get_evaluator(config) if use_ai else None
         ai_enabled = use_ai and evaluator and evaluator.is_available()
         
-        results = []
-        success_count = 0
-        fail_count = 0
-        
-        for video in videos:
+        async def process_video(video):
             video_name = video.get("name", "")
             if "." in video_name:
                 base_name = video_name.rsplit(".", 1)[0]
@@ -803,10 +976,11 @@ async def batch_download_subtitles(request: Request):
                     
                     if ai_enabled:
                         print(f"  Using AI evaluation for {video_name}, evaluating {len(search_results)} subtitles...")
+                        filename_scores = calculate_filename_similarities(video_name, [sub.name for sub in search_results])
                         
                         async def evaluate_single_video_subtitle(sub, idx):
                             try:
-                                filename_score = calculate_filename_similarity(video_name, sub.name)
+                                filename_score = filename_scores[idx]
                                 
                                 if filename_score == 0:
                                     return None
@@ -823,7 +997,7 @@ async def batch_download_subtitles(request: Request):
                                 except UnicodeDecodeError:
                                     content = sub_data.decode('gbk', errors='ignore')
                                 
-                                eval_result = evaluator.evaluate(content, sub.ext or "srt")
+                                eval_result = await evaluator.evaluate_async(content, sub.ext or "srt")
                                 
                                 if eval_result.available:
                                     quality_score = eval_result.overall_score
@@ -842,14 +1016,11 @@ async def batch_download_subtitles(request: Request):
                                 print(f"    AI eval failed for {sub.name}: {e}")
                                 return None
                         
-                        batch_size = 5
-                        all_eval_results = []
-                        
-                        for i in range(0, len(search_results), batch_size):
-                            batch = search_results[i:i + batch_size]
-                            tasks = [evaluate_single_video_subtitle(sub, idx) for idx, sub in enumerate(batch)]
-                            batch_results = await asyncio.gather(*tasks)
-                            all_eval_results.extend([r for r in batch_results if r is not None])
+                        batch_results = await gather_limited(
+                            AI_EVAL_CONCURRENCY,
+                            *[evaluate_single_video_subtitle(sub, idx) for idx, sub in enumerate(search_results)]
+                        )
+                        all_eval_results = [r for r in batch_results if r is not None]
                         
                         if all_eval_results:
                             all_eval_results.sort(key=lambda x: x['final_score'], reverse=True)
@@ -861,17 +1032,15 @@ async def batch_download_subtitles(request: Request):
                             print(f"    Best: {best_subtitle.name} (匹配度:{best['filename_score']:.0f}% 综合分:{best['final_score']:.2f})")
                         else:
                             print(f"    所有字幕匹配度均为0，跳过下载")
-                            results.append({
+                            return {
                                 "video": video_name,
                                 "status": "no_match",
                                 "message": "所有字幕匹配度为0"
-                            })
-                            fail_count += 1
-                            continue
+                            }
                     else:
                         best_filename_score = 0
-                        for sub in search_results:
-                            filename_score = calculate_filename_similarity(video_name, sub.name)
+                        filename_scores = calculate_filename_similarities(video_name, [sub.name for sub in search_results])
+                        for sub, filename_score in zip(search_results, filename_scores):
                             if filename_score > best_filename_score:
                                 best_filename_score = filename_score
                                 best_subtitle = sub
@@ -880,13 +1049,11 @@ async def batch_download_subtitles(request: Request):
                             print(f"    Best by filename: {best_subtitle.name} (匹配度:{best_filename_score:.0f}%)")
                         else:
                             print(f"    所有字幕匹配度均为0，跳过下载")
-                            results.append({
+                            return {
                                 "video": video_name,
                                 "status": "no_match",
                                 "message": "所有字幕匹配度为0"
-                            })
-                            fail_count += 1
-                            continue
+                            }
                         
                         subtitle_data = await download_with_retries(
                             client,
@@ -910,8 +1077,7 @@ async def batch_download_subtitles(request: Request):
                         
                         file_path = os.path.join(save_dir, filename)
                         
-                        with open(file_path, 'wb') as f:
-                            f.write(subtitle_data)
+                        await asyncio.to_thread(Path(file_path).write_bytes, subtitle_data)
                         
                         result_item = {
                             "video": video_name,
@@ -925,34 +1091,39 @@ async def batch_download_subtitles(request: Request):
                             result_item["ai_score"] = best_subtitle_ai_score
                             result_item["is_machine_translation"] = best_subtitle_is_mt
                         
-                        results.append(result_item)
-                        success_count += 1
                         print(f"Success: {video_name} -> {filename}" + 
                               (f" (AI: {best_subtitle_ai_score})" if ai_enabled else ""))
+                        return result_item
                     else:
-                        results.append({
+                        return {
                             "video": video_name,
                             "status": "failed",
                             "error": "Save directory not configured"
-                        })
-                        fail_count += 1
+                        }
                 else:
-                    results.append({
+                    print(f"Not found: {video_name}")
+                    return {
                         "video": video_name,
                         "status": "not_found",
                         "error": "No subtitles found"
-                    })
-                    fail_count += 1
-                    print(f"Not found: {video_name}")
+                    }
                 
             except Exception as e:
-                results.append({
+                print(f"Failed: {video_name} - {e}")
+                return {
                     "video": video_name,
                     "status": "failed",
                     "error": str(e)
-                })
-                fail_count += 1
-                print(f"Failed: {video_name} - {e}")
+                }
+        
+        # Videos are independent, so search/download several at once (each still
+        # caps its own subtitle evaluations at AI_EVAL_CONCURRENCY)
+        results = await gather_limited(
+            max(1, int(config.get("concurrency", 3))),
+            *[process_video(video) for video in videos]
+        )
+        success_count = sum(1 for r in results if r["status"] == "success")
+        fail_count = len(results) - success_count
         
         return SafeJSONResponse(content={
             "success": True,
@@ -1086,9 +1257,9 @@ async def start_watcher():
             )
             watcher.add_watch_directory(watch_dir)
     
-    watcher.set_process_callback(process_new_video_file)
+    watcher.set_process_callback(process_new_video_files)
     
-    success = watcher.start()
+    success = await watcher.start_async()
     
     if success:
         save_watcher_config()
@@ -1151,7 +1322,7 @@ async def add_watch_directory(watch_dir: WatchDirectoryModel):
 @app.delete("/api/watcher/directories")
 async def remove_watch_directory(request: Request):
     """Remove a watch directory"""
-    data = await request.json()
+    data = await _request_json(request)
     path = data.get("path", "")
     
     success = watcher.remove_watch_directory(path)
@@ -1201,14 +1372,14 @@ async def get_download_history():
     """Get download history"""
     return SafeJSONResponse(content={
         "success": True,
-        "history": _download_history
+        "history": list(_download_history)
     })
 
 
 @app.post("/api/history")
 async def add_history_item(request: Request):
     """Add item to download history"""
-    data = await request.json()
+    data = await _request_json(request)
     add_download_history(data)
     return SafeJSONResponse(content={
         "success": True,
@@ -1219,9 +1390,8 @@ async def add_history_item(request: Request):
 @app.delete("/api/history")
 async def clear_download_history():
     """Clear download history"""
-    global _download_history
-    _download_history = []
-    save_download_history()
+    _download_history.clear()
+    await flush_download_history()
     return SafeJSONResponse(content={
         "success": True,
         "message": "历史已清空"
@@ -1241,7 +1411,8 @@ def save_watcher_config():
             "enabled": wd["enabled"],
             "file_types": wd["file_types"],
             "output_dir": wd["output_dir"],
-            "use_ai": wd["use_ai"]
+            "use_ai": wd["use_ai"],
+            "debounce_s": wd["debounce_s"]
         })
     
     if "directory_watcher" not in config:
@@ -1253,6 +1424,18 @@ def save_watcher_config():
     print(f"[Watcher] Config saved: {len(clean_watch_dirs)} directories")
 
 
+# Max new files from one watcher batch that are processed at once
+WATCHER_FILE_CONCURRENCY = 4
+
+async def process_new_video_files(file_paths: List[str], watch_dir: WatchDirectory):
+    """Process a debounced batch of new video files detected by watcher"""
+    print(f"[Watcher] Processing batch of {len(file_paths)} new file(s)")
+    await gather_limited(
+        WATCHER_FILE_CONCURRENCY,
+        *[process_new_video_file(file_path, watch_dir) for file_path in file_paths]
+    )
+
+
 async def process_new_video_file(file_path: str, watch_dir: WatchDirectory):
     """Process a new video file detected by watcher"""
     try:
@@ -1264,7 +1447,7 @@ async def process_new_video_file(file_path: str, watch_dir: WatchDirectory):
         else:
             base_name = file_name
         
-        client = ThunderClient()
+        client = get_client()
         search_results = await client.search(query=base_name)
         
         if not search_results:
@@ -1283,10 +1466,11 @@ async def process_new_video_file(file_path: str, watch_dir: WatchDirectory):
             
             if evaluator.is_available():
                 print(f"[Watcher] Starting parallel AI evaluation for top 10 subtitles...")
+                filename_scores = calculate_filename_similarities(file_name, [sub.name for sub in search_results])
                 
                 async def evaluate_single_subtitle(sub, idx):
                     try:
-                        filename_score = calculate_filename_similarity(file_name, sub.name)
+                        filename_score = filename_scores[idx]
                         
                         if filename_score == 0:
                             print(f"[Watcher] 跳过字幕: {sub.name} (匹配度:0%)")
@@ -1304,7 +1488,7 @@ async def process_new_video_file(file_path: str, watch_dir: WatchDirectory):
                         except UnicodeDecodeError:
                             content = sub_data.decode('gbk', errors='ignore')
                         
-                        eval_result = evaluator.evaluate(content, sub.ext or "srt")
+                        eval_result = await evaluator.evaluate_async(content, sub.ext or "srt")
                         
                         if eval_result.available:
                             quality_score = eval_result.overall_score
@@ -1328,17 +1512,11 @@ async def process_new_video_file(file_path: str, watch_dir: WatchDirectory):
                 
                 print(f"[Watcher] Starting parallel AI evaluation for {len(search_results)} subtitles...")
                 
-                batch_size = 5
-                all_results = []
-                
-                for i in range(0, len(search_results), batch_size):
-                    batch = search_results[i:i + batch_size]
-                    tasks = [
-                        evaluate_single_subtitle(sub, idx) 
-                        for idx, sub in enumerate(batch)
-                    ]
-                    batch_results = await asyncio.gather(*tasks)
-                    all_results.extend([r for r in batch_results if r is not None])
+                batch_results = await gather_limited(
+                    AI_EVAL_CONCURRENCY,
+                    *[evaluate_single_subtitle(sub, idx) for idx, sub in enumerate(search_results)]
+                )
+                all_results = [r for r in batch_results if r is not None]
                 
                 valid_results = all_results
                 
@@ -1365,8 +1543,8 @@ async def process_new_video_file(file_path: str, watch_dir: WatchDirectory):
         
         if not best_subtitle:
             best_filename_score = 0
-            for sub in search_results:
-                filename_score = calculate_filename_similarity(file_name, sub.name)
+            filename_scores = calculate_filename_similarities(file_name, [sub.name for sub in search_results])
+            for sub, filename_score in zip(search_results, filename_scores):
                 if filename_score > best_filename_score:
                     best_filename_score = filename_score
                     best_subtitle = sub
@@ -1403,8 +1581,8 @@ async def process_new_video_file(file_path: str, watch_dir: WatchDirectory):
         clean_name = clean_subtitle_filename(base_name)
         subtitle_path = os.path.join(output_dir, f"{clean_name}.{ext}")
         
-        with open(subtitle_path, 'wb') as f:
-            f.write(subtitle_data)
+        # Off the event loop: the other files in this batch keep downloading meanwhile.
+        await asyncio.to_thread(Path(subtitle_path).write_bytes, subtitle_data)
         
         print(f"[Watcher] Subtitle saved: {subtitle_path} (cleaned name: {clean_name}, format: {actual_ext})")
         
@@ -1446,6 +1624,20 @@ async def download_with_retries(
                 await asyncio.sleep(retry_sleep_s)
     raise last_err
 
+
+# Max subtitles downloaded + evaluated at once when picking the best match
+AI_EVAL_CONCURRENCY = 8
+
+async def gather_limited(limit: int, *aws):
+    """asyncio.gather with at most `limit` awaitables running at once"""
+    sem = asyncio.Semaphore(limit)
+    
+    async def _run(aw):
+        async with sem:
+            return await aw
+    
+    return await asyncio.gather(*(_run(aw) for aw in aws))
+
 # ==================== SMB APIs ====================
 
 def check_smb_available():
@@ -1659,7 +1851,7 @@ async def api_smb_download(smb_config: SmbConfigModel):
             ai_evaluator = get_evaluator(config)
         
         results = []
-        client = ThunderClient()
+        client = get_client()
         
         for video in videos:
             video_name = os.path.splitext(video["name"])[0]
@@ -1681,10 +1873,11 @@ async def api_smb_download(smb_config: SmbConfigModel):
                 
                 if ai_evaluator and ai_evaluator.is_available():
                     print(f"[SMB] AI评估已启用，正在并发评估 {len(search_results)} 个字幕...")
+                    filename_scores = calculate_filename_similarities(video["name"], [item.name for item in search_results])
                     
                     async def evaluate_single_smb_subtitle(item, idx):
                         try:
-                            filename_score = calculate_filename_similarity(video["name"], item.name)
+                            filename_score = filename_scores[idx]
                             
                             if filename_score == 0:
                                 return None
@@ -1694,7 +1887,7 @@ async def api_smb_download(smb_config: SmbConfigModel):
                             text = extract_text(text_content, item.ext)
                             
                             if text:
-                                result = ai_evaluator.evaluate(text[:2000], item.ext)
+                                result = await ai_evaluator.evaluate_async(text[:2000], item.ext)
                                 quality_score = result.overall_score
                                 final_score = filename_score * 0.4 + quality_score * 0.6
                                 print(f"[SMB] 评估字幕: {item.name} -> 匹配度:{filename_score:.0f}% 质量分:{quality_score:.0f} 综合分:{final_score:.2f}")
@@ -1710,14 +1903,11 @@ async def api_smb_download(smb_config: SmbConfigModel):
                             print(f"[SMB] 评估字幕失败: {item.name} -> {e}")
                             return None
                     
-                    batch_size = 5
-                    all_eval_results = []
-                    
-                    for i in range(0, len(search_results), batch_size):
-                        batch = search_results[i:i + batch_size]
-                        tasks = [evaluate_single_smb_subtitle(item, idx) for idx, item in enumerate(batch)]
-                        batch_results = await asyncio.gather(*tasks)
-                        all_eval_results.extend([r for r in batch_results if r is not None])
+                    batch_results = await gather_limited(
+                        AI_EVAL_CONCURRENCY,
+                        *[evaluate_single_smb_subtitle(item, idx) for idx, item in enumerate(search_results)]
+                    )
+                    all_eval_results = [r for r in batch_results if r is not None]
                     
                     if all_eval_results:
                         all_eval_results.sort(key=lambda x: x['final_score'], reverse=True)
@@ -1733,8 +1923,8 @@ async def api_smb_download(smb_config: SmbConfigModel):
                     
                     best_subtitle = None
                     best_score = 0
-                    for item in search_results:
-                        filename_score = calculate_filename_similarity(video["name"], item.name)
+                    filename_scores = calculate_filename_similarities(video["name"], [item.name for item in search_results])
+                    for item, filename_score in zip(search_results, filename_scores):
                         if filename_score > best_score:
                             best_score = filename_score
                             best_subtitle = item
@@ -1775,15 +1965,8 @@ async def api_smb_download(smb_config: SmbConfigModel):
                     smb_subtitle_path = f"{smb_subtitle_dir}/{clean_name}.{ext}"
                     
                     try:
-                        temp_file = f"temp_subtitle_{clean_name}.{ext}"
-                        with open(temp_file, 'wb') as f:
-                            f.write(subtitle_data)
-                        
-                        with open(temp_file, 'rb') as f:
-                            conn.storeFile(smb_config.share, smb_subtitle_path, f)
-                        
-                        import os as os_module
-                        os_module.remove(temp_file)
+                        # Upload straight from memory; no temp file round-trip through the CWD.
+                        conn.storeFile(smb_config.share, smb_subtitle_path, io.BytesIO(subtitle_data))
                         
                         subtitle_path = f"\\\\{smb_config.host}\\{smb_config.share}{smb_subtitle_path}"
                     except Exception as smb_err:
@@ -1792,12 +1975,10 @@ async def api_smb_download(smb_config: SmbConfigModel):
                         if not os.path.exists(smb_dir_path):
                             os.makedirs(smb_dir_path, exist_ok=True)
                         subtitle_path = os.path.join(smb_dir_path, f"{clean_name}.{ext}")
-                        with open(subtitle_path, 'wb') as f:
-                            f.write(subtitle_data)
+                        await asyncio.to_thread(Path(subtitle_path).write_bytes, subtitle_data)
                 else:
                     subtitle_path = os.path.join(output_dir, f"{clean_name}.{ext}")
-                    with open(subtitle_path, 'wb') as f:
-                        f.write(subtitle_data)
+                    await asyncio.to_thread(Path(subtitle_path).write_bytes, subtitle_data)
                 
                 results.append({
                     "video": video["name"],
@@ -1839,12 +2020,31 @@ async def api_get_smb_config():
 async def api_save_smb_config(smb_config: Dict[str, Any]):
     """Save SMB configuration"""
     config["smb"] = smb_config
-    save_config()
+    await asyncio.to_thread(save_config)
     return {"success": True}
 
+def _kernel_supports_io_uring() -> bool:
+    """io_uring event loops need Linux 5.11+"""
+    if sys.platform != "linux":
+        return False
+    match = re.match(r'(\d+)\.(\d+)', platform.release())
+    return bool(match) and (int(match.group(1)), int(match.group(2))) >= (5, 11)
+
+def select_server_backends() -> tuple[str, str]:
+    """Prefer uringcore (io_uring), then uvloop, and httptools when installed (uvloop is not available on Windows)"""
+    if _kernel_supports_io_uring() and importlib.util.find_spec("uringcore"):
+        loop = "uringcore"
+    elif importlib.util.find_spec("uvloop"):
+        loop = "uvloop"
+    else:
+        loop = "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
 # Run server
 def run_server(host: str = "127.0.0.1", port: int = 8000):
     """Start server"""
+    loop, http = select_server_backends()
     print(f"Starting FastAPI server...")
     if host == "0.0.0.0":
         print(f"Access URL: http://127.0.0.1:{port} (本机访问)")
@@ -1854,11 +2054,20 @@ def run_server(host: str = "127.0.0.1", port: int = 8000):
     print(f"Static directory: {STATIC_DIR}")
     print(f"Templates directory: {TEMPLATES_DIR}")
     print(f"Config file: {CONFIG_FILE}")
+    print(f"Event loop: {loop}, HTTP parser: {http}")
+    
+    if loop == "uringcore":
+        # uvicorn has no built-in io_uring loop; install the policy and let it use the default
+        import uringcore
+        asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+        loop = "none"
     
     uvicorn.run(
         app,
         host=host,
         port=port,
+        loop=loop,
+        http=http,
         log_level="info",
         use_colors=False
     )
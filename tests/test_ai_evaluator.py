@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import thunder_subtitle_cli.ai_evaluator as ai_mod
+from thunder_subtitle_cli.ai_evaluator import (
+    AIEvaluator,
+    calculate_filename_similarities,
+    calculate_filename_similarity,
+    get_evaluator,
+)
+
+
+@pytest.fixture(params=[True, False], ids=["rapidfuzz", "fallback"])
+def matcher(request, monkeypatch):
+    if request.param and not ai_mod.HAS_RAPIDFUZZ:
+        pytest.skip("rapidfuzz not installed")
+    monkeypatch.setattr(ai_mod, "HAS_RAPIDFUZZ", request.param)
+    return calculate_filename_similarity
+
+
+def test_filename_similarity_ignores_separators_and_ext(matcher) -> None:
+    assert matcher("Movie.Name.2019.mkv", "movie_name [2019].srt") == 100.0
+    assert matcher("SSIS-123.mp4", "ssis123.srt") == 100.0
+
+
+def test_filename_similarity_unrelated_is_zero(matcher) -> None:
+    assert matcher("abc", "xyz") == 0.0
+    assert matcher("", "xyz") == 0.0
+
+
+def test_filename_similarity_year_mismatch_penalized(matcher) -> None:
+    same = matcher("The.Matrix.1999.mkv", "the matrix 1999 extended.srt")
+    diff = matcher("The.Matrix.1999.mkv", "the matrix 2003 extended.srt")
+    assert same > diff
+
+
+def test_filename_similarities_matches_single_calls(matcher) -> None:
+    video = "The.Matrix.1999.1080p.mkv"
+    subs = ["the matrix 1999.srt", "The Matrix 2003.ass", "unrelated", "", "TheMatrix1999.chs.srt"]
+    assert calculate_filename_similarities(video, subs) == [matcher(video, s) for s in subs]
+
+
+def test_parse_response_extracts_embedded_json() -> None:
+    res = AIEvaluator._parse_response('结果如下：{"fluency": 8, "overall_score": 80, "issues": ["x"]} 以上', 0.5)
+    assert res.available
+    assert res.overall_score == 80.0
+    assert res.issues == ["x"]
+
+
+def test_parse_response_without_json_is_unavailable() -> None:
+    res = AIEvaluator._parse_response("无法评估", 0.5)
+    assert not res.available
+    assert res.error == "无法解析AI响应"
+
+
+def test_evaluate_reuses_cached_result_for_same_text(monkeypatch) -> None:
+    calls = []
+
+    class _Completions:
+        def create(self, **kwargs):
+            calls.append(kwargs)
+            message = SimpleNamespace(content='{"overall_score": 75, "issues": []}')
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(ai_mod, "HAS_OPENAI", True)
+    monkeypatch.setattr(ai_mod, "_ai_cache", {})
+    evaluator = AIEvaluator(api_key="k", base_url="https://example.invalid", model="m")
+    evaluator._client = SimpleNamespace(chat=SimpleNamespace(completions=_Completions()))
+
+    content = "\n".join(f"{i}\n00:00:0{i},000 --> 00:00:0{i},500\n第{i}句台词，内容各不相同。\n" for i in range(1, 9))
+    first = evaluator.evaluate(content, "srt")
+    second = evaluator.evaluate(content, "srt")
+    assert first.overall_score == second.overall_score == 75.0
+    assert len(calls) == 1
+
+
+def test_invalid_patterns_count_overlapping_watermarks() -> None:
+    text = "\n".join(["www.sis001.com"] * 3 + [f"第{i}句" for i in range(10)])
+    matched = {m.lastgroup for m in ai_mod._INVALID_RE.finditer(text)}
+    assert matched == {"invalid1", "invalid7"}
+
+
+def test_get_evaluator_reuses_instance_until_config_changes() -> None:
+    cfg = {"ai_evaluator": {"enabled": True, "api_key": "k", "base_url": "https://a.invalid", "model": "m"}}
+    first = get_evaluator(cfg)
+    assert get_evaluator(cfg) is first
+    cfg["ai_evaluator"]["model"] = "m2"
+    second = get_evaluator(cfg)
+    assert second is not first and second.model == "m2"
+    assert get_evaluator({}) is get_evaluator({"ai_evaluator": {"enabled": False}})
+
+
+def test_async_client_is_closed_when_replaced(monkeypatch) -> None:
+    closed = []
+
+    class _AsyncClient:
+        def __init__(self, **kwargs):
+            self.base_url = kwargs["base_url"]
+
+        async def close(self):
+            closed.append(self.base_url)
+
+    if not ai_mod.HAS_OPENAI:
+        pytest.skip("openai not installed")
+    monkeypatch.setattr(ai_mod, "AsyncOpenAI", _AsyncClient)
+    monkeypatch.setattr(ai_mod, "_async_client", None)
+
+    async def _main():
+        first = ai_mod._get_async_client("k", "https://a.invalid")
+        assert ai_mod._get_async_client("k", "https://a.invalid") is first
+        ai_mod._get_async_client("k", "https://b.invalid")
+        await asyncio.sleep(0)
+
+    asyncio.run(_main())
+    assert closed == ["https://a.invalid"]
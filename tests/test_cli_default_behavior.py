@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from pathlib import Path
+
+import httpx
+import respx
 from typer.testing import CliRunner
 
 import thunder_subtitle_cli.cli as cli_mod
@@ -17,3 +21,25 @@ def test_no_args_prints_help_when_not_tty(monkeypatch) -> None:
     assert res.exit_code == 0
     assert "Commands" in res.output
 
+
+
+@respx.mock
+def test_batch_keeps_same_named_items_apart(tmp_path: Path) -> None:
+    item = {"ext": "srt", "name": "Same", "duration": 1, "languages": ["zh-CN"], "source": 0, "score": 1.0, "fingerprintf_score": 0, "extra_name": "", "mt": 0}
+    respx.get("https://api-shoulei-ssl.xunlei.com/oracle/subtitle").mock(
+        return_value=httpx.Response(
+            200,
+            json={"code": 0, "result": "ok", "data": [
+                {**item, "gcid": "g1", "cid": "c1", "url": "https://u/1"},
+                {**item, "gcid": "g2", "cid": "c2", "url": "https://u/2"},
+            ]},
+        )
+    )
+    respx.get("https://u/1").mock(return_value=httpx.Response(200, content=b"one"))
+    respx.get("https://u/2").mock(return_value=httpx.Response(200, content=b"two"))
+
+    res = CliRunner().invoke(
+        cli_mod.app, ["batch", "q", "--out-dir", str(tmp_path), "--no-interactive", "--select", "0-1", "--no-cache"]
+    )
+    assert res.exit_code == 0, res.output
+    assert sorted(p.read_bytes() for p in (tmp_path / "q").iterdir()) == [b"one", b"two"]
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import asyncio
 
+import pytest
+
 import respx
 import httpx
 
-from thunder_subtitle_cli.client import ThunderClient
+from thunder_subtitle_cli.cache import MemorySearchCache, SearchCache
+from thunder_subtitle_cli.client import ThunderAPIError, ThunderClient, download_to_with_retries
 
 
 @respx.mock
@@ -37,3 +40,131 @@ def test_search_returns_empty_on_non_ok_response() -> None:
     client = ThunderClient()
     items = asyncio.run(client.search(query="q", timeout_s=5.0))
     assert items == []
+
+
+@respx.mock
+def test_search_uses_disk_cache(tmp_path) -> None:
+    route = respx.get("https://api-shoulei-ssl.xunlei.com/oracle/subtitle").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "code": 0,
+                "result": "ok",
+                "data": [
+                    {"gcid": "g1", "cid": "c1", "url": "https://u/1", "ext": "srt", "name": "A", "duration": 1, "languages": ["zh-CN"], "source": 0, "score": 1.2, "fingerprintf_score": 0, "extra_name": "", "mt": 0},
+                ],
+            },
+        )
+    )
+    cache = SearchCache(cache_dir=tmp_path, ttl_s=60.0)
+    first = asyncio.run(ThunderClient(cache=cache).search(query="q", timeout_s=5.0))
+    second = asyncio.run(ThunderClient(cache=cache).search(query="q", timeout_s=5.0))
+    assert route.call_count == 1
+    assert second == first
+
+    expired = SearchCache(cache_dir=tmp_path, ttl_s=0.0)
+    asyncio.run(ThunderClient(cache=expired).search(query="q", timeout_s=5.0))
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_download_to_streams_and_keeps_old_file_on_failure(tmp_path) -> None:
+    respx.get("https://u/ok").mock(return_value=httpx.Response(200, content=b"x" * 200_000))
+    respx.get("https://u/gone").mock(return_value=httpx.Response(404))
+    client = ThunderClient()
+
+    path = tmp_path / "a.srt"
+    n = asyncio.run(download_to_with_retries(client, url="https://u/ok", path=path, timeout_s=5.0, retries=0))
+    assert n == 200_000
+    assert path.read_bytes() == b"x" * 200_000
+
+    with pytest.raises(ThunderAPIError):
+        asyncio.run(download_to_with_retries(client, url="https://u/gone", path=path, timeout_s=5.0, retries=1, retry_sleep_s=0))
+    assert path.read_bytes() == b"x" * 200_000
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@respx.mock
+def test_search_uses_memory_cache() -> None:
+    route = respx.get("https://api-shoulei-ssl.xunlei.com/oracle/subtitle").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "code": 0,
+                "result": "ok",
+                "data": [
+                    {"gcid": "g1", "cid": "c1", "url": "https://u/1", "ext": "srt", "name": "A", "duration": 1, "languages": ["zh-CN"], "source": 0, "score": 1.2, "fingerprintf_score": 0, "extra_name": "", "mt": 0},
+                ],
+            },
+        )
+    )
+    client = ThunderClient(cache=MemorySearchCache(ttl_s=60.0))
+    first = asyncio.run(client.search(query="the  movie", timeout_s=5.0))
+    second = asyncio.run(client.search(query=" the movie ", timeout_s=5.0))
+    assert route.call_count == 1
+    assert second == first
+
+    expired = ThunderClient(cache=MemorySearchCache(ttl_s=0.0))
+    asyncio.run(expired.search(query="q", timeout_s=5.0))
+    asyncio.run(expired.search(query="q", timeout_s=5.0))
+    assert route.call_count == 3
+
+
+@respx.mock
+def test_concurrent_identical_searches_share_one_request() -> None:
+    route = respx.get("https://api-shoulei-ssl.xunlei.com/oracle/subtitle").mock(
+        return_value=httpx.Response(200, json={"code": 0, "result": "ok", "data": []}),
+    )
+    client = ThunderClient()
+
+    async def _both() -> list[list]:
+        return await asyncio.gather(client.search(query="q"), client.search(query=" q "))
+
+    assert asyncio.run(_both()) == [[], []]
+    assert route.call_count == 1
+    assert client._inflight == {}
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    cache = MemorySearchCache(ttl_s=60.0, max_entries=2)
+    cache.set(base_url="b", query="a", items=[])
+    cache.set(base_url="b", query="b", items=[])
+    assert cache.get(base_url="b", query="a") == []
+    cache.set(base_url="b", query="c", items=[])
+    assert cache.get(base_url="b", query="b") is None
+    assert cache.get(base_url="b", query="a") == []
+
+
+@respx.mock
+def test_prime_opens_connection_and_ignores_errors() -> None:
+    route = respx.head("https://api-shoulei-ssl.xunlei.com").mock(side_effect=httpx.ConnectError("down"))
+    asyncio.run(ThunderClient().prime())
+    assert route.called
+
+
+@respx.mock
+def test_download_prefix_sends_range_and_caps_ignored_range() -> None:
+    route = respx.get("https://u/big").mock(return_value=httpx.Response(200, content=b"x" * 100_000))
+    data = asyncio.run(ThunderClient().download_prefix(url="https://u/big", max_bytes=1000))
+    assert data == b"x" * 1000
+    assert route.calls.last.request.headers["Range"] == "bytes=0-999"
+
+    respx.get("https://u/empty").mock(return_value=httpx.Response(416))
+    assert asyncio.run(ThunderClient().download_prefix(url="https://u/empty", max_bytes=1000)) == b""
+
+
+@respx.mock
+def test_shared_client_leaves_no_open_pools_after_asyncio_run() -> None:
+    respx.head("https://api-shoulei-ssl.xunlei.com").mock(return_value=httpx.Response(200))
+    client = ThunderClient()
+    sessions = []
+
+    async def _use() -> None:
+        await client.prime()
+        sessions.append(client._get_session())
+
+    for _ in range(5):
+        asyncio.run(_use())
+    assert len(sessions) == 5
+    assert all(s.is_closed for s in sessions)
+    assert not client._sessions
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from thunder_subtitle_cli.directory_watcher import HAS_WATCHDOG, VideoFileHandler, WatchDirectory
+
+pytestmark = pytest.mark.skipif(not HAS_WATCHDOG, reason="watchdog not installed")
+
+
+def test_handler_dispatches_one_deduplicated_batch(tmp_path) -> None:
+    from watchdog.events import FileCreatedEvent, FileModifiedEvent
+
+    batches: list[list[str]] = []
+    done = threading.Event()
+
+    def _on_new_file(paths, watch_dir) -> None:
+        batches.append(paths)
+        done.set()
+
+    wd = WatchDirectory(path=str(tmp_path), debounce_s=0.05)
+    handler = VideoFileHandler(watch_dir=wd, on_new_file=_on_new_file, file_types=[".mkv"])
+
+    a = tmp_path / "a.mkv"
+    b = tmp_path / "b.MKV"
+    a.write_bytes(b"x")
+    b.write_bytes(b"y")
+    (tmp_path / "c.txt").write_bytes(b"z")
+    for p in (a, b, a, tmp_path / "c.txt"):
+        handler.on_created(FileCreatedEvent(str(p)))
+    handler.on_modified(FileModifiedEvent(str(a)))
+
+    assert done.wait(timeout=5)
+    handler.close()
+    assert len(batches) == 1
+    assert sorted(batches[0]) == sorted([str(a), str(b)])
+
+
+def test_handler_processed_files_is_bounded(tmp_path) -> None:
+    from watchdog.events import FileCreatedEvent
+
+    got: list[str] = []
+    done = threading.Event()
+
+    def _on_new_file(paths, watch_dir) -> None:
+        got.extend(paths)
+        if len(got) >= 3:
+            done.set()
+
+    wd = WatchDirectory(path=str(tmp_path), debounce_s=0.02)
+    handler = VideoFileHandler(watch_dir=wd, on_new_file=_on_new_file, file_types=[".mp4"])
+    handler.MAX_PROCESSED_FILES = 2
+    for i in range(3):
+        p = tmp_path / f"{i}.mp4"
+        p.write_bytes(b"x")
+        handler.on_created(FileCreatedEvent(str(p)))
+
+    assert done.wait(timeout=5)
+    handler.close()
+    assert len(handler._processed_files) == 2
+
+
+def test_async_callback_runs_on_captured_loop(tmp_path) -> None:
+    import asyncio
+
+    from thunder_subtitle_cli.directory_watcher import DirectoryWatcher
+
+    async def _main() -> None:
+        loop = asyncio.get_running_loop()
+        seen: asyncio.Future = loop.create_future()
+
+        async def _process(paths, watch_dir) -> None:
+            seen.set_result((asyncio.get_running_loop(), paths))
+
+        w = DirectoryWatcher()
+        w.set_process_callback(_process)
+        await w.start_async()
+        wd = WatchDirectory(path=str(tmp_path))
+        t = threading.Thread(target=w._on_new_file, args=(["x.mp4"], wd))
+        t.start()
+        got_loop, paths = await asyncio.wait_for(seen, timeout=5)
+        t.join()
+        w.stop()
+        assert got_loop is loop
+        assert paths == ["x.mp4"]
+
+    asyncio.run(_main())
+
+
+def test_async_callback_failure_is_logged(tmp_path) -> None:
+    import asyncio
+
+    from thunder_subtitle_cli.directory_watcher import DirectoryWatcher
+
+    async def _main() -> DirectoryWatcher:
+        async def _process(paths, watch_dir) -> None:
+            raise RuntimeError("boom")
+
+        w = DirectoryWatcher()
+        w.set_process_callback(_process)
+        await w.start_async()
+        wd = WatchDirectory(path=str(tmp_path))
+        t = threading.Thread(target=w._on_new_file, args=(["x.mp4"], wd))
+        t.start()
+        t.join()
+        for _ in range(100):
+            if any(e["status"] == "error" for e in w.get_event_log()):
+                break
+            await asyncio.sleep(0.01)
+        w.stop()
+        return w
+
+    w = asyncio.run(_main())
+    errors = [e for e in w.get_event_log() if e["status"] == "error"]
+    assert errors and "boom" in errors[0]["message"]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+
+from thunder_subtitle_cli.formatting import to_json
+from thunder_subtitle_cli.models import ThunderSubtitleItem
+from thunder_subtitle_cli.util import compute_item_id
+
+
+def test_to_json_matches_dataclass_fields() -> None:
+    it = ThunderSubtitleItem(
+        gcid="g1",
+        cid="c1",
+        url="https://example.invalid/sub",
+        ext="srt",
+        name="名字",
+        duration=1,
+        languages=["zh-CN"],
+        source=0,
+        score=9.9,
+        fingerprintf_score=0.0,
+        extra_name="",
+        mt=0,
+    )
+    assert it.to_dict() == asdict(it)
+    out = to_json([it])
+    assert "名字" in out
+    assert json.loads(out) == [{**asdict(it), "id": compute_item_id(gcid="g1", cid="c1")}]
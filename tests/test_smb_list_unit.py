@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 from pathlib import Path
+from types import SimpleNamespace
 
+import pytest
+from smb.base import NotConnectedError
+from smb.smb_structs import OperationFailure
+
+import thunder_subtitle_cli.smb_list as smb_mod
 from thunder_subtitle_cli.smb_list import (
     build_unc_dir,
     extract_episode_num,
     filter_and_sort_episode_files,
     match_episode_filename,
+    smb_listdir,
     write_episode_list,
 )
 
@@ -54,3 +61,62 @@ def test_write_episode_list(tmp_path: Path) -> None:
     write_episode_list(output_path=out, episode_files=["a.mp4", "b.mp4"])
     assert out.read_text(encoding="utf-8") == "a.mp4\nb.mp4\n"
 
+
+
+def test_smb_listdir_reuses_and_reconnects_pooled_connection(monkeypatch) -> None:
+    connects: list[object] = []
+
+    class _Conn:
+        def __init__(self, broken: bool) -> None:
+            self.broken = broken
+            self.closed = False
+
+        def listPath(self, share, path):
+            if self.broken:
+                raise NotConnectedError()
+            return [SimpleNamespace(filename=n) for n in (".", "..", "a.mp4")]
+
+        def close(self) -> None:
+            self.closed = True
+
+    def _connect(**kwargs):
+        conn = _Conn(broken=not connects)
+        connects.append(conn)
+        return conn
+
+    monkeypatch.setattr(smb_mod, "_connect", _connect)
+    monkeypatch.setattr(smb_mod, "_SMB_POOL", {})
+    kwargs = dict(host="h", share="s", dir_path="d", user="u", password="p")
+    assert smb_listdir(**kwargs) == ["a.mp4"]
+    assert smb_listdir(**kwargs) == ["a.mp4"]
+    assert len(connects) == 2
+    assert connects[0].closed
+    smb_mod.close_smb_pool()
+    assert connects[1].closed
+
+
+def test_smb_listdir_operation_failure_keeps_pooled_connection(monkeypatch) -> None:
+    connects: list[object] = []
+
+    class _Conn:
+        closed = False
+
+        def listPath(self, share, path):
+            raise OperationFailure("no such directory", [])
+
+        def close(self) -> None:
+            self.closed = True
+
+    def _connect(**kwargs):
+        conn = _Conn()
+        connects.append(conn)
+        return conn
+
+    monkeypatch.setattr(smb_mod, "_connect", _connect)
+    monkeypatch.setattr(smb_mod, "_SMB_POOL", {})
+    kwargs = dict(host="h", share="s", dir_path="missing", user="u", password="p")
+    for _ in range(2):
+        with pytest.raises(OperationFailure):
+            smb_listdir(**kwargs)
+    assert len(connects) == 1
+    assert not connects[0].closed
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 
-from thunder_subtitle_cli.core import format_item_label, resolve_out_dir
+import httpx
+import pytest
+import respx
+
+from thunder_subtitle_cli.core import download_item, download_items, format_item_label, resolve_out_dir, top_by_score
 from thunder_subtitle_cli.models import ThunderSubtitleItem
 
 
-def _item(*, name: str = "A", ext: str = "srt", score: float = 9.9) -> ThunderSubtitleItem:
+def _item(
+    *, name: str = "A", ext: str = "srt", score: float = 9.9, url: str = "https://example.invalid/sub"
+) -> ThunderSubtitleItem:
     return ThunderSubtitleItem(
         gcid="g",
         cid="c",
-        url="https://example.invalid/sub",
+        url=url,
         ext=ext,
         name=name,
         duration=0,
@@ -40,3 +47,45 @@ def test_format_item_label_contains_fields() -> None:
     assert "1.23" in s
     assert "lang=" in s
 
+
+
+def test_top_by_score_matches_stable_sort() -> None:
+    items = [_item(name=n, score=s) for n, s in [("a", 1.0), ("b", 5.0), ("c", 5.0), ("d", 3.0), ("e", 9.0)]]
+    expected = sorted(items, key=lambda x: x.score, reverse=True)
+    assert top_by_score(items, 3) == expected[:3]
+    assert top_by_score(items, 10) == expected
+
+
+@respx.mock
+def test_download_items_keeps_same_named_files_apart(tmp_path) -> None:
+    respx.get("https://example.invalid/1").mock(return_value=httpx.Response(200, content=b"one"))
+    respx.get("https://example.invalid/2").mock(return_value=httpx.Response(200, content=b"two"))
+    respx.get("https://example.invalid/bad").mock(return_value=httpx.Response(404))
+    items = [
+        _item(name="A", url="https://example.invalid/1"),
+        _item(name="A", url="https://example.invalid/2"),
+        _item(name="B", url="https://example.invalid/bad"),
+    ]
+    res = asyncio.run(download_items(items=items, out_dir=tmp_path, retries=0))
+    assert res[0] == tmp_path / "A.srt"
+    assert res[1] == tmp_path / "A (1).srt"
+    assert isinstance(res[2], Exception)
+    assert res[0].read_bytes() == b"one"
+    assert res[1].read_bytes() == b"two"
+
+
+@respx.mock
+def test_download_item_overwrite_is_atomic(tmp_path) -> None:
+    respx.get("https://example.invalid/ok").mock(return_value=httpx.Response(200, content=b"new"))
+    respx.get("https://example.invalid/bad").mock(return_value=httpx.Response(500))
+    target = tmp_path / "A.srt"
+    target.write_bytes(b"old")
+
+    with pytest.raises(Exception):
+        asyncio.run(download_item(item=_item(url="https://example.invalid/bad"), out_dir=tmp_path, retries=0, overwrite=True))
+    assert target.read_bytes() == b"old"
+
+    path = asyncio.run(download_item(item=_item(url="https://example.invalid/ok"), out_dir=tmp_path, retries=0, overwrite=True))
+    assert path == target
+    assert target.read_bytes() == b"new"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["A.srt"]
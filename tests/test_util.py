@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from thunder_subtitle_cli.util import ensure_unique_path, parse_select_spec, sanitize_component
+from thunder_subtitle_cli.util import compute_item_id, ensure_unique_path, parse_select_spec, sanitize_component
 
 
 def test_parse_select_spec_basic() -> None:
@@ -17,6 +17,16 @@ def test_parse_select_spec_ranges_and_dedup() -> None:
     assert parse_select_spec("3-1") == [1, 2, 3]
 
 
+def test_parse_select_spec_overlapping_wide_ranges() -> None:
+    assert parse_select_spec("5-10000,1-3,2,9990-10002") == [1, 2, 3, *range(5, 10003)]
+
+
+@pytest.mark.parametrize("spec", ["a", "1-", "1;2", "1 2", "3--1"])
+def test_parse_select_spec_rejects_malformed(spec: str) -> None:
+    with pytest.raises(ValueError):
+        parse_select_spec(spec)
+
+
 def test_sanitize_component_removes_separators_and_controls() -> None:
     assert "/" not in sanitize_component("a/b")
     assert "\\" not in sanitize_component("a\\b")
@@ -30,3 +40,27 @@ def test_ensure_unique_path(tmp_path: Path) -> None:
     assert p2 != p
     assert p2.name.startswith("a (")
 
+
+def test_ensure_unique_path_continues_after_highest_number(tmp_path: Path) -> None:
+    for name in ("a.srt", "a (1).srt", "a (7).srt", "a (x).srt", "b (9).srt"):
+        (tmp_path / name).write_text("x", encoding="utf-8")
+    assert ensure_unique_path(tmp_path / "a.srt").name == "a (8).srt"
+    reserved = {tmp_path / "a (8).srt"}
+    assert ensure_unique_path(tmp_path / "a.srt", reserved=reserved).name == "a (9).srt"
+
+
+def test_ensure_unique_path_treats_dangling_symlink_as_taken(tmp_path: Path) -> None:
+    link = tmp_path / "a.srt"
+    link.symlink_to(tmp_path / "missing")
+    assert ensure_unique_path(link).name == "a (1).srt"
+
+
+def test_ensure_unique_path_under_a_file_parent(tmp_path: Path) -> None:
+    parent = tmp_path / "not_a_dir"
+    parent.write_text("x", encoding="utf-8")
+    assert ensure_unique_path(parent / "a.srt") == parent / "a.srt"
+
+
+def test_compute_item_id_separates_fields() -> None:
+    assert compute_item_id(gcid="ab", cid="c") != compute_item_id(gcid="a", cid="bc")
+    assert len(compute_item_id(gcid="g", cid="c")) == 32
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def web():
+    # Importing the app initialises ui_config.json next to the repo; do not leave one behind.
+    config_file = Path(__file__).resolve().parent.parent / "ui_config.json"
+    existed = config_file.exists()
+    mod = importlib.import_module("thunder_subtitle_cli.web_ui_fastapi")
+    yield mod
+    if not existed:
+        config_file.unlink(missing_ok=True)
+
+
+class _FakeWatcher:
+    def __init__(self) -> None:
+        self.dirs: list[dict] = []
+        self.started = False
+
+    def add_watch_directory(self, watch_dir) -> bool:
+        self.dirs.append({"path": watch_dir.path})
+        return True
+
+    def get_watch_directories(self) -> list[dict]:
+        return self.dirs
+
+    def set_process_callback(self, callback) -> None:
+        pass
+
+    async def start_async(self) -> None:
+        self.started = True
+
+
+def test_import_config_autostarts_enabled_watcher(web, monkeypatch, tmp_path) -> None:
+    fake = _FakeWatcher()
+    monkeypatch.setattr(web, "watcher", fake)
+    monkeypatch.setattr(web, "save_config", lambda: None)
+    monkeypatch.setattr(web, "config", dict(web.config))
+
+    body = {"directory_watcher": {"enabled": True, "watch_directories": [{"path": str(tmp_path)}]}}
+    res = TestClient(web.app).post("/api/config/import", json=body).json()
+
+    assert res["success"]
+    assert fake.dirs == [{"path": str(tmp_path)}]
+    assert fake.started
+
+
+def test_delayed_history_saves_do_not_overlap_or_drop_items(web, monkeypatch) -> None:
+    import asyncio
+    import threading
+    import time
+
+    writes: list[list] = []
+    active = 0
+    overlap = False
+    guard = threading.Lock()
+
+    def slow_save(history=None) -> None:
+        nonlocal active, overlap
+        with guard:
+            active += 1
+            overlap = overlap or active > 1
+        time.sleep(0.05)
+        writes.append(list(history))
+        with guard:
+            active -= 1
+
+    monkeypatch.setattr(web, "save_download_history", slow_save)
+    monkeypatch.setattr(web, "HISTORY_FLUSH_DELAY_S", 0.0)
+    monkeypatch.setattr(web, "_download_history", web.deque(maxlen=web.HISTORY_MAX_ITEMS))
+    monkeypatch.setattr(web, "_history_write_lock", asyncio.Lock())
+
+    async def _run() -> None:
+        web.add_download_history({"n": 1})
+        await asyncio.sleep(0.02)
+        # Lands while the first save is still writing
+        web.add_download_history({"n": 2})
+        while web._history_flush_task is not None:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(_run())
+    assert not overlap
+    assert writes[-1] == [{"n": 2}, {"n": 1}]
+
+
+def test_write_json_concurrent_writers_each_land_whole(web, tmp_path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    target = tmp_path / "history.json"
+    payloads = [[{"n": i, "pad": "x" * 20000}] for i in range(16)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda obj: web._write_json(target, obj), payloads))
+
+    assert web._read_json(target) in payloads
+    assert [p.name for p in tmp_path.iterdir()] == ["history.json"]